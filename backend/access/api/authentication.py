@@ -1,25 +1,96 @@
-from access.api.models import Session
-from django.utils import timezone
+from access.api.models import Session, revoked_sessions
+from access.api.rules import MatrixData, permission_matrix
+from access.api.tokens import (SessionToken, TokenUser, read_session_token,
+                               signed_tokens_enabled)
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from users.models import User
+
+_NOT_RESOLVED = object()
+
+
+def make_token_user(
+        token: SessionToken,
+        matrix: MatrixData = None
+) -> TokenUser:
+    if matrix is None:
+        matrix = permission_matrix.get_data()
+    return TokenUser(
+        token,
+        lambda: User.objects.select_related('role').get(pk=token.user_id),
+        role=matrix.get_role_by_id(token.role_id),
+    )
+
+
+def resolve_session_user(cookie: str):
+    """
+    Вернет пользователя по значению cookie sessionid или None.
+    Подписанный токен проверяется без запросов к БД (кроме периодической
+    загрузки списка отзыва), session_id - через Session.get_active_user.
+    """
+    if signed_tokens_enabled():
+        token = read_session_token(cookie)
+        if token is not None:
+            if token.is_expired or token.session_id in revoked_sessions:
+                return None
+            return make_token_user(token)
+
+    return Session.get_active_user(cookie)
+
+
+async def aresolve_session_user(cookie: str):
+    """Асинхронная версия resolve_session_user."""
+    if signed_tokens_enabled():
+        token = read_session_token(cookie)
+        if token is not None:
+            if token.is_expired:
+                return None
+            if await revoked_sessions.acontains(token.session_id):
+                return None
+            return make_token_user(token, await permission_matrix.aget_data())
+
+    return await Session.aget_active_user(cookie)
+
+
+def get_session_user(request):
+    """
+    Вернет пользователя сессии из cookie sessionid или None.
+    Результат запоминается в HttpRequest, поэтому middleware и
+    DRF-аутентификация разрешают сессию один раз за запрос.
+    """
+    user = getattr(request, '_session_user', _NOT_RESOLVED)
+    if user is _NOT_RESOLVED:
+        session_id = request.COOKIES.get('sessionid')
+        user = resolve_session_user(session_id) if session_id else None
+        request._session_user = user
+    return user
+
+
+async def aget_session_user(request):
+    """Асинхронная версия get_session_user."""
+    user = getattr(request, '_session_user', _NOT_RESOLVED)
+    if user is _NOT_RESOLVED:
+        session_id = request.COOKIES.get('sessionid')
+        user = (
+            await aresolve_session_user(session_id) if session_id else None
+        )
+        request._session_user = user
+    return user
 
 
 class CustomSessionAuthentication(BaseAuthentication):
-    """Аутентификация по sessionid для DRF."""
+    """
+    Аутентификация по sessionid для DRF.
+    Использует пользователя, уже найденного SessionAuthenticationMiddleware.
+    """
 
     def authenticate(self, request):
-        session_id = request.COOKIES.get('sessionid')
-        if not session_id:
+        if not request.COOKIES.get('sessionid'):
             return None
 
-        try:
-            session = Session.objects.select_related('user').get(
-                session_id=session_id,
-                is_valid=True,
-                expire_at__gt=timezone.now()
-            )
-            return session.user, None
-        except Session.DoesNotExist:
+        user = get_session_user(request._request)
+        if user is None:
             raise AuthenticationFailed(
                 'Недействительная или просроченная сессия.'
             )
+        return user, None
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntFlag
 
 
 class Action(str, Enum):
@@ -9,3 +9,19 @@ class Action(str, Enum):
 
     def __str__(self):
         return self.value
+
+
+class Permission(IntFlag):
+    """Биты прав AccessRule. Имя флага соответствует полю can_<имя>."""
+
+    READ_OWN = 1
+    READ_ALL = 2
+    CREATE = 4
+    UPDATE_OWN = 8
+    UPDATE_ALL = 16
+    DELETE_OWN = 32
+    DELETE_ALL = 64
+
+    @property
+    def field_name(self) -> str:
+        return f'can_{self.name.lower()}'
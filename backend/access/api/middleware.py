@@ -1,30 +1,143 @@
+import time
+
 from access.api.exceptions import ObjectAccessDeniedError
-from django.http import JsonResponse
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from users.hashing import PasswordHashingBusyError
+from utils.codec import JsonResponse
+from utils.instrumentation import (enable_query_recording, finish_profile,
+                                   instrumentation_enabled, metrics,
+                                   server_timing, start_profile)
 from utils.utils import ValidationError
 
 
+class InstrumentationMiddleware:
+    """
+    Профилирование запросов (INSTRUMENTATION['ENABLED']): время, SQL и
+    span-ы по view в utils.instrumentation.metrics и заголовок
+    Server-Timing. Ставится первым, чтобы учесть весь стек.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not instrumentation_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = settings.INSTRUMENTATION.get(
+            'SERVER_TIMING', True
+        )
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        enable_query_recording()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = start_profile()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile = finish_profile(token)
+        return self._record(request, response, profile)
+
+    async def __acall__(self, request):
+        token = start_profile()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profile = finish_profile(token)
+        return self._record(request, response, profile)
+
+    def _record(self, request, response, profile):
+        duration = time.perf_counter() - profile.start
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        metrics.observe(
+            view, request.method, response.status_code, duration, profile
+        )
+        if self.server_timing:
+            response['Server-Timing'] = server_timing(profile, duration)
+        return response
+
+
 class ErrorHandlerMiddleware:
     """Middleware для перехвата исключений."""
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
         return self.get_response(request)
 
     def process_exception(self, request, exception):
-        if isinstance(exception, ObjectAccessDeniedError):
-            status = getattr(exception, 'status', 403)
-            return JsonResponse(
-                {'error': str(exception)},
-                status=status
-            )
-
-        elif isinstance(exception, ValidationError):
-            status = getattr(exception, 'status', 400)
-            return JsonResponse(
-                {'error': str(exception)},
-                status=status
-            )
-
-        return None
\ No newline at end of file
+        return exception_response(exception)
+
+
+class AsyncViewMiddleware:
+    """
+    Под ASGI вызывает async-вариант view (utils.views.async_variant)
+    вместо sync-view, которое Django выполнил бы в потоке через
+    sync_to_async. Под WSGI не подключается. Ставится последним.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not iscoroutinefunction(get_response):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        return await self.get_response(request)
+
+    async def process_view(self, request, view_func, view_args, view_kwargs):
+        async_view = getattr(view_func, 'async_view', None)
+        if async_view is None:
+            return None
+        # process_exception не вызывается для ответа из process_view.
+        try:
+            return await async_view(request, *view_args, **view_kwargs)
+        except Exception as exception:
+            response = exception_response(exception)
+            if response is None:
+                raise
+            return response
+
+
+def exception_response(exception) -> JsonResponse | None:
+    """Ответ на исключение проекта или None для остальных."""
+    if isinstance(exception, ObjectAccessDeniedError):
+        status = getattr(exception, 'status', 403)
+        return JsonResponse(
+            {'error': str(exception)},
+            status=status
+        )
+
+    elif isinstance(exception, PasswordHashingBusyError):
+        response = JsonResponse(
+            {'error': str(exception)},
+            status=exception.status
+        )
+        response['Retry-After'] = str(exception.retry_after)
+        return response
+
+    elif isinstance(exception, ValidationError):
+        status = getattr(exception, 'status', 400)
+        return JsonResponse(
+            {'error': str(exception)},
+            status=status
+        )
+
+    return None
@@ -1,7 +1,12 @@
 import uuid
 
-from django.db import models
+from access.api.session_store import get_session_store
+from access.api.tokens import (RevocationList, make_session_token,
+                               read_session_token, signed_tokens_enabled)
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, models
 from django.utils import timezone
+from utils.db import reading_from_replica
 
 
 class AccessRole(models.Model):
@@ -65,9 +70,12 @@ class Session(models.Model):
         default=uuid.uuid4,
         editable=False,
     )
+    # SET_NULL: при удалении пользователя отозванные сессии остаются до
+    # истечения, по ним строится список отзыва подписанных токенов.
     user = models.ForeignKey(
         'users.User',
-        on_delete=models.CASCADE,
+        on_delete=models.SET_NULL,
+        null=True,
     )
     session_id = models.CharField(
         max_length=128,
@@ -79,6 +87,17 @@ class Session(models.Model):
 
     class Meta:
         db_table = 'sessions'
+        indexes = [
+            # Session.get_active_user: только действующие сессии.
+            models.Index(
+                fields=['session_id', 'expire_at'],
+                include=['user_id'],
+                condition=models.Q(is_valid=True),
+                name='sessions_valid_lookup_idx',
+            ),
+            # purge_sessions: удаление истекших.
+            models.Index(fields=['expire_at'], name='sessions_expire_at_idx'),
+        ]
 
     def __str__(self):
         return f'Session {self.session_id} for {self.user}'
@@ -88,11 +107,152 @@ class Session(models.Model):
         session_id = cls.generate_session_id()
         expire_at = timezone.now() + timezone.timedelta(hours=hours_valid)
 
-        return cls.objects.create(
+        session = cls.objects.create(
             user=user,
             session_id=session_id,
             expire_at=expire_at
         )
+        get_session_store().set(
+            session_id,
+            user,
+            ttl=(expire_at - timezone.now()).total_seconds()
+        )
+        return session
+
+    @property
+    def cookie_value(self) -> str:
+        """Значение cookie sessionid: session_id или подписанный токен."""
+        if not signed_tokens_enabled():
+            return self.session_id
+
+        return make_session_token(
+            self.user_id,
+            self.user.role_id,
+            self.expire_at,
+            self.session_id
+        )
+
+    @classmethod
+    def session_id_from_cookie(cls, cookie: str) -> str:
+        """Извлечет session_id из значения cookie sessionid."""
+        if signed_tokens_enabled():
+            token = read_session_token(cookie)
+            if token is not None:
+                return token.session_id
+        return cookie
+
+    @classmethod
+    def get_active_user(cls, session_id: str):
+        """
+        Вернет пользователя действующей сессии или None.
+        Сначала ищет в хранилище SESSION_STORE, затем в БД; найденный
+        пользователь хранится до истечения сессии, но не дольше TTL.
+        """
+        store = get_session_store()
+        user = store.get(session_id)
+        if user is None:
+            now = timezone.now()
+            for queryset in cls._lookup_querysets():
+                try:
+                    session = queryset.get(
+                        session_id=session_id,
+                        is_valid=True,
+                        expire_at__gt=now
+                    )
+                    break
+                except cls.DoesNotExist:
+                    continue
+            else:
+                return None
+
+            user = session.user
+            store.set(
+                session_id,
+                user,
+                ttl=(session.expire_at - now).total_seconds()
+            )
+
+        return user
+
+    @classmethod
+    async def aget_active_user(cls, session_id: str):
+        """Асинхронная версия get_active_user."""
+        store = get_session_store()
+        user = await store.aget(session_id)
+        if user is None:
+            now = timezone.now()
+            for queryset in cls._lookup_querysets():
+                try:
+                    session = await queryset.aget(
+                        session_id=session_id,
+                        is_valid=True,
+                        expire_at__gt=now
+                    )
+                    break
+                except cls.DoesNotExist:
+                    continue
+            else:
+                return None
+
+            user = session.user
+            await store.aset(
+                session_id,
+                user,
+                ttl=(session.expire_at - now).total_seconds()
+            )
+
+        return user
+
+    @classmethod
+    def _lookup_querysets(cls) -> tuple:
+        """Поиск сессии: на реплике, при промахе (отставание) - в default."""
+        queryset = cls.objects.select_related('user__role')
+        if reading_from_replica():
+            return queryset, queryset.using(DEFAULT_DB_ALIAS)
+        return (queryset,)
+
+    @classmethod
+    def evict_cached_for_user(cls, user_id):
+        """Удалит из хранилища все действующие сессии пользователя."""
+        cls.evict_cached_for_users([user_id])
+
+    @classmethod
+    def evict_cached_for_users(cls, user_ids):
+        """Удалит из хранилища действующие сессии пользователей."""
+        store = get_session_store()
+        if not store.enabled:
+            return
+
+        session_ids = list(cls.objects.filter(
+            user_id__in=user_ids,
+            is_valid=True,
+            expire_at__gt=timezone.now()
+        ).values_list('session_id', flat=True))
+        store.delete_many(session_ids)
+
+    @classmethod
+    def invalidate_for_user(cls, user_id):
+        """Сделает недействительными все сессии пользователя."""
+        cls.invalidate_for_users([user_id])
+
+    @classmethod
+    def invalidate_for_users(cls, user_ids):
+        """Сделает недействительными все сессии пользователей."""
+        sessions = list(cls.objects.filter(
+            user_id__in=user_ids,
+            is_valid=True,
+            expire_at__gt=timezone.now()
+        ).values_list('session_id', 'expire_at'))
+        cls.objects.filter(user_id__in=user_ids, is_valid=True).update(
+            is_valid=False
+        )
+
+        get_session_store().delete_many(
+            session_id for session_id, expire_at in sessions
+        )
+        if signed_tokens_enabled():
+            for session_id, expire_at in sessions:
+                revoked_sessions.add(session_id, expire_at)
 
     @staticmethod
     def generate_session_id() -> str:
@@ -103,8 +263,28 @@ class Session(models.Model):
         """Делает сессию недействительной (logout)."""
         self.is_valid = False
         self.save()
+        get_session_store().delete(self.session_id)
+        # Список отзыва нужен только подписанным токенам; без них он
+        # не перечитывается и рос бы бесконечно.
+        if signed_tokens_enabled():
+            revoked_sessions.add(self.session_id, self.expire_at)
 
     @property
     def is_expired(self) -> bool:
         """Проверка, истекла ли сессия."""
         return not self.is_valid or self.expire_at <= timezone.now()
+
+
+def load_revoked_sessions():
+    return Session.objects.filter(
+        is_valid=False,
+        expire_at__gt=timezone.now()
+    ).values_list('session_id', 'expire_at')
+
+
+revoked_sessions = RevocationList(
+    load_revoked_sessions,
+    refresh_interval=getattr(settings, 'SESSION_TOKENS', {}).get(
+        'REVOCATION_REFRESH', 30
+    ),
+)
@@ -1,18 +1,20 @@
 from functools import wraps
 
+from access.api.constants import Action
 from access.api.exceptions import ObjectAccessDeniedError
-from access.api.models import AccessRule
-from django.http import JsonResponse
+from access.api.rules import MatrixData, PackedRule, permission_matrix
+from asgiref.sync import iscoroutinefunction
+from auth.api.guest import GUEST_ROLE_NAME, GuestUser
 from rest_framework import permissions
 from users.models import User
+from utils.codec import JsonResponse
+from utils.instrumentation import span
 
 
 class IsAdmin(permissions.BasePermission):
     """Разрешает доступ только пользователям с ролью 'admin'."""
     def has_permission(self, request, view):
-        user = getattr(request, 'user', None)
-        return bool(user and getattr(user, 'role', None) and
-                    user.role.name == 'admin')
+        return getattr(request.user, 'is_admin', False)
 
 
 def check_access(
@@ -21,79 +23,133 @@ def check_access(
         require_auth: bool = True,
         require_admin: bool = False
 ):
-    """Проверяет доступ к endpoint-у."""
+    """
+    Проверяет доступ к endpoint-у.
+    Поддерживает как обычные, так и асинхронные view.
+    """
     def decorator(view_func):
+        checks = (allowed_methods, get_rules_for, require_auth, require_admin)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                with span('rules'):
+                    matrix = None
+                    if get_rules_for:
+                        matrix = await permission_matrix.aget_data()
+                    error = check_request(request, *checks, matrix=matrix)
+                if error is not None:
+                    return error
+                return await view_func(request, *args, **kwargs)
+
+            return async_wrapper
+
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            if request.method not in allowed_methods:
-                return JsonResponse(
-                    {'error': f'Метод {request.method} не разрешен.'},
-                    status=405
-                )
-
-            user = request.user
-
-            if require_auth and not getattr(user, 'is_active', False):
-                return JsonResponse(
-                    {'error': 'Требуется аутентификация.'},
-                    status=401
-                )
-
-            if require_admin and not getattr(user, 'is_admin', False):
-                return JsonResponse(
-                    {'error': 'Требуются права администратора.'},
-                    status=403
-                )
-
-            if get_rules_for:
-                access_rules = get_access_rules(user, get_rules_for)
-                if not access_rules:
-                    return JsonResponse(
-                        {'error': f'Для роли ({user.role}) не определены '
-                                  f'правила доступа к ресурсу '
-                                  f'({get_rules_for}).'},
-                        status=403
-                    )
-                request.access_rules = access_rules
-            else:
-                request.access_rules = None
-
+            with span('rules'):
+                error = check_request(request, *checks)
+            if error is not None:
+                return error
             return view_func(request, *args, **kwargs)
 
         return wrapper
     return decorator
 
 
-def get_access_rules(user: User, element_name: str) -> AccessRule | None:
-    """Вернет rule object для элемента или None."""
-    try:
-        return user.role.rules.get(element__name=element_name)
-    except AccessRule.DoesNotExist:
-        return None
+def check_request(
+        request,
+        allowed_methods: list[str],
+        get_rules_for: str = None,
+        require_auth: bool = True,
+        require_admin: bool = False,
+        matrix: MatrixData = None
+) -> JsonResponse | None:
+    """
+    Выполнит проверки check_access и установит request.access_rules.
+    Вернет ответ с ошибкой или None, если доступ разрешен.
+    matrix - снимок матрицы правил (в async-коде).
+    """
+    if request.method not in allowed_methods:
+        return JsonResponse(
+            {'error': f'Метод {request.method} не разрешен.'},
+            status=405
+        )
+
+    user = request.user
+
+    if require_auth and not getattr(user, 'is_active', False):
+        return JsonResponse(
+            {'error': 'Требуется аутентификация.'},
+            status=401
+        )
+
+    if require_admin and not getattr(user, 'is_admin', False):
+        return JsonResponse(
+            {'error': 'Требуются права администратора.'},
+            status=403
+        )
+
+    if get_rules_for:
+        access_rules = get_access_rules(user, get_rules_for, matrix)
+        if not access_rules:
+            role = (
+                GUEST_ROLE_NAME if type(user) is GuestUser
+                else getattr(user, 'role', None)
+            )
+            return JsonResponse(
+                {'error': f'Для роли ({role}) не определены '
+                          f'правила доступа к ресурсу '
+                          f'({get_rules_for}).'},
+                status=403
+            )
+        request.access_rules = access_rules
+    else:
+        request.access_rules = None
+
+    return None
+
+
+def get_access_rules(
+        user: User,
+        element_name: str,
+        matrix: MatrixData = None
+) -> PackedRule | None:
+    """
+    Вернет правила роли пользователя для элемента или None.
+    Роль гостя берется из того же снимка matrix.
+    """
+    if matrix is None:
+        matrix = permission_matrix.get_data()
+    if type(user) is GuestUser:
+        role = matrix.get_role(GUEST_ROLE_NAME)
+        role_id = role.id if role is not None else None
+    else:
+        role_id = getattr(user, 'role_id', None)
+    return matrix.get(role_id, element_name)
 
 
 def check_object_access(
         request_user: User,
         target_obj,
-        access_rules: AccessRule,
+        access_rules: PackedRule,
         action: str
 ):
     """Проверит доступ к конкретному объекту."""
-    if not access_rules:
-        raise ObjectAccessDeniedError('Нет прав доступа.')
-
-    if action == 'create':
-        if not getattr(access_rules, 'can_create', False):
-            raise ObjectAccessDeniedError('Нет прав на создание.')
-        return
-
-    action_field = f'can_{action}'
-    can_all = getattr(access_rules, f'{action_field}_all', False)
-    can_own = getattr(access_rules, f'{action_field}_own', False)
-
-    if can_all or (can_own and is_owner(request_user, target_obj)):
-        return
-    raise ObjectAccessDeniedError('Доступ к объекту запрещен.')
+    with span('object_access'):
+        if not access_rules:
+            raise ObjectAccessDeniedError('Нет прав доступа.')
+
+        if action == Action.CREATE:
+            if not access_rules.can_create:
+                raise ObjectAccessDeniedError('Нет прав на создание.')
+            return
+
+        if access_rules.allows_all(action) or (
+            access_rules.allows_own(action)
+            and is_owner(request_user, target_obj)
+        ):
+            return
+        raise ObjectAccessDeniedError('Доступ к объекту запрещен.')
 
 def is_owner(request_user, target_obj):
     """Является ли пользователь владельцем объекта."""
@@ -0,0 +1,39 @@
+from access.api.rules import PackedRule, permission_matrix
+from django.db import models
+
+
+class AccessQuerySet(models.QuerySet):
+    """
+    QuerySet ресурса с проверкой прав на уровне SQL.
+
+    Модель задает access_element (имя BusinessElement) и
+    access_owner_field (поле с id владельца, по умолчанию owner_id).
+    """
+
+    def for_user(
+            self,
+            user,
+            action: str,
+            access_rules: PackedRule = None
+    ):
+        """
+        Оставит объекты, доступные user для action: все при *_all,
+        свои (WHERE owner_field = user.id) при *_own, иначе ни одного.
+        access_rules - уже найденные правила (request.access_rules).
+        """
+        if access_rules is None:
+            access_rules = permission_matrix.get(
+                getattr(user, 'role_id', None),
+                self.model.access_element
+            )
+        if not access_rules:
+            return self.none()
+
+        if access_rules.allows_all(action):
+            return self
+        if access_rules.allows_own(action):
+            owner_field = getattr(
+                self.model, 'access_owner_field', 'owner_id'
+            )
+            return self.filter(**{owner_field: user.id})
+        return self.none()
@@ -0,0 +1,148 @@
+"""
+Очистка таблицы sessions.
+
+Удаляются истекшие сессии, а без подписанных токенов - и отозванные
+(is_valid=False). При SESSION_TOKENS['SIGNED'] отозванные сессии хранятся
+до истечения: по ним строится список отзыва.
+
+SessionReaper запускается первым запросом процесса (не в manage.py), а
+проход выполняет только процесс, взявший reaper_lock.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from access.api.models import Session
+from access.api.tokens import signed_tokens_enabled
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки Postgres для очистки сессий.
+REAPER_LOCK_ID = 720_201
+
+
+@contextmanager
+def reaper_lock():
+    """
+    Попробует взять advisory-блокировку очистки; вернет, удалось ли.
+    Вне Postgres блокировка не берется и считается полученной.
+    """
+    if connection.vendor != 'postgresql':
+        yield True
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', [REAPER_LOCK_ID])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_advisory_unlock(%s)', [REAPER_LOCK_ID]
+                )
+
+
+def purge_sessions(
+        batch_size: int = 1000,
+        delay: float = 0.0,
+        max_batches: int = None
+) -> int:
+    """
+    Удалит ненужные сессии пачками по batch_size с паузой delay секунд
+    между пачками (не более max_batches пачек). Вернет число удаленных.
+    """
+    condition = Q(expire_at__lte=timezone.now())
+    if not signed_tokens_enabled():
+        condition |= Q(is_valid=False)
+    sessions = Session.objects.filter(condition)
+
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(sessions.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted += Session.objects.filter(pk__in=ids).delete()[0]
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if delay:
+            time.sleep(delay)
+    return deleted
+
+
+class SessionReaper(threading.Thread):
+    """Фоновый поток: purge_sessions раз в interval секунд."""
+
+    def __init__(
+            self,
+            interval: float = 300,
+            batch_size: int = 1000,
+            delay: float = 0.1,
+            max_batches: int = None
+    ):
+        super().__init__(name='session-reaper', daemon=True)
+        self.interval = interval
+        self.options = {
+            'batch_size': batch_size,
+            'delay': delay,
+            'max_batches': max_batches,
+        }
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                with reaper_lock() as acquired:
+                    if not acquired:
+                        continue
+                    deleted = purge_sessions(**self.options)
+                if deleted:
+                    logger.info('Удалено сессий: %s.', deleted)
+            except Exception:
+                logger.exception('Ошибка очистки сессий.')
+            finally:
+                connection.close()
+
+    def stop(self):
+        self._stopped.set()
+
+
+_reaper = None
+_start_lock = threading.Lock()
+
+
+def start_reaper(**kwargs) -> SessionReaper:
+    """
+    Запустит SessionReaper процесса (один раз). Вызывается сигналом
+    request_started (connect_reaper), поэтому поток есть только в
+    процессах, обслуживающих запросы.
+    """
+    global _reaper
+    with _start_lock:
+        if _reaper is None:
+            config = getattr(settings, 'SESSION_REAPER', {})
+            _reaper = SessionReaper(
+                interval=config.get('INTERVAL', 300),
+                batch_size=config.get('BATCH_SIZE', 1000),
+                delay=config.get('BATCH_DELAY', 0.1),
+                max_batches=config.get('MAX_BATCHES'),
+            )
+            _reaper.start()
+            request_started.disconnect(dispatch_uid='session-reaper')
+    return _reaper
+
+
+def connect_reaper():
+    """Запустит SessionReaper при первом запросе, если он включен."""
+    if getattr(settings, 'SESSION_REAPER', {}).get('ENABLED', False):
+        request_started.connect(
+            start_reaper, weak=False, dispatch_uid='session-reaper'
+        )
@@ -0,0 +1,200 @@
+import threading
+import time
+from contextlib import nullcontext
+from typing import NamedTuple
+
+from access.api.constants import Action, Permission
+from access.api.models import AccessRole, AccessRule
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from utils.db import use_primary
+
+# Ключи - и Action, и его строковое значение: хэш Enum-а отличается от
+# хэша строки, а check_object_access принимает оба варианта.
+OWN_BITS = {
+    key: int(permission)
+    for action, permission in (
+        (Action.READ, Permission.READ_OWN),
+        (Action.CREATE, Permission.CREATE),
+        (Action.UPDATE, Permission.UPDATE_OWN),
+        (Action.DELETE, Permission.DELETE_OWN),
+    )
+    for key in (action, action.value)
+}
+ALL_BITS = {
+    key: int(permission)
+    for action, permission in (
+        (Action.READ, Permission.READ_ALL),
+        (Action.CREATE, Permission.CREATE),
+        (Action.UPDATE, Permission.UPDATE_ALL),
+        (Action.DELETE, Permission.DELETE_ALL),
+    )
+    for key in (action, action.value)
+}
+
+
+def _flag(permission: Permission):
+    bit = int(permission)
+    return property(lambda self: bool(self.mask & bit))
+
+
+class PackedRule:
+    """
+    Неизменяемые права AccessRule, упакованные в битовую маску.
+    Экземпляры с одинаковой маской переиспользуются.
+    """
+
+    __slots__ = ('mask',)
+    _instances = {}
+
+    def __new__(cls, mask: int = 0):
+        mask = int(mask)
+        instance = cls._instances.get(mask)
+        if instance is None:
+            instance = super().__new__(cls)
+            object.__setattr__(instance, 'mask', mask)
+            instance = cls._instances.setdefault(mask, instance)
+        return instance
+
+    @classmethod
+    def from_rule(cls, rule: AccessRule) -> 'PackedRule':
+        return cls(sum(
+            permission for permission in Permission
+            if getattr(rule, permission.field_name)
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('PackedRule неизменяем.')
+
+    def __delattr__(self, name):
+        raise AttributeError('PackedRule неизменяем.')
+
+    def __reduce__(self):
+        return PackedRule, (self.mask,)
+
+    def __eq__(self, other):
+        if isinstance(other, PackedRule):
+            return self.mask == other.mask
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.mask)
+
+    def __repr__(self):
+        return f'PackedRule({Permission(self.mask)!r})'
+
+    def allows_own(self, action: Action) -> bool:
+        """Разрешено ли действие над своими объектами."""
+        return bool(self.mask & OWN_BITS[action])
+
+    def allows_all(self, action: Action) -> bool:
+        """Разрешено ли действие над любыми объектами."""
+        return bool(self.mask & ALL_BITS[action])
+
+    can_read_own = _flag(Permission.READ_OWN)
+    can_read_all = _flag(Permission.READ_ALL)
+    can_create = _flag(Permission.CREATE)
+    can_update_own = _flag(Permission.UPDATE_OWN)
+    can_update_all = _flag(Permission.UPDATE_ALL)
+    can_delete_own = _flag(Permission.DELETE_OWN)
+    can_delete_all = _flag(Permission.DELETE_ALL)
+
+
+class MatrixData(NamedTuple):
+    """Снимок матрицы правил; не меняется после загрузки."""
+
+    rules: dict
+    roles: dict
+    roles_by_id: dict
+
+    def get(self, role_id, element_name: str) -> PackedRule | None:
+        return self.rules.get((role_id, element_name))
+
+    def get_role(self, name: str) -> AccessRole | None:
+        return self.roles.get(name)
+
+    def get_role_by_id(self, role_id) -> AccessRole | None:
+        return self.roles_by_id.get(role_id)
+
+
+class PermissionMatrix:
+    """
+    Правила доступа всех ролей в памяти процесса:
+    (role_id, имя элемента) → PackedRule, а также роли по имени.
+
+    Загружается при первом обращении, сбрасывается сигналами
+    (access.api.signals) и не живет дольше ttl секунд, чтобы изменения
+    из других процессов тоже применялись.
+    """
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._data = None
+        self._expires = 0
+        self._generation = 0
+        self._from_primary = False
+        self._lock = threading.Lock()
+
+    def get(self, role_id, element_name: str) -> PackedRule | None:
+        return self.get_data().get(role_id, element_name)
+
+    def get_role(self, name: str) -> AccessRole | None:
+        return self.get_data().get_role(name)
+
+    def get_role_by_id(self, role_id) -> AccessRole | None:
+        return self.get_data().get_role_by_id(role_id)
+
+    def get_data(self) -> MatrixData:
+        """Текущий снимок; загрузит его из БД, если он устарел."""
+        data = self._data
+        if data is None or self._expires <= time.monotonic():
+            data = self.load()
+        return data
+
+    async def aget_data(self) -> MatrixData:
+        """
+        Асинхронная версия get_data. В async-коде правила читаются
+        только из полученного снимка: повторное обращение к матрице
+        могло бы загрузить ее из БД прямо в event loop.
+        """
+        data = self._data
+        if data is None or self._expires <= time.monotonic():
+            data = await sync_to_async(self.load)()
+        return data
+
+    def load(self) -> MatrixData:
+        with self._lock:
+            # Пока ждали блокировку, матрицу мог загрузить другой поток.
+            data = self._data
+            if data is not None and self._expires > time.monotonic():
+                return data
+            generation = self._generation
+            from_primary = self._from_primary
+            with use_primary() if from_primary else nullcontext():
+                roles = list(AccessRole.objects.all())
+                rules = AccessRule.objects.select_related('element')
+                data = MatrixData(
+                    rules={
+                        (rule.role_id, rule.element.name):
+                            PackedRule.from_rule(rule)
+                        for rule in rules
+                    },
+                    roles={role.name: role for role in roles},
+                    roles_by_id={role.id: role for role in roles},
+                )
+            if generation == self._generation:
+                self._data = data
+                self._expires = time.monotonic() + self.ttl
+                self._from_primary = False
+            return data
+
+    def invalidate(self):
+        """Сбросит матрицу; следующая загрузка - из default, не с реплики."""
+        self._generation += 1
+        self._from_primary = True
+        self._data = None
+
+
+permission_matrix = PermissionMatrix(
+    ttl=getattr(settings, 'ACCESS_RULES_CACHE', {}).get('TTL', 60),
+)
@@ -0,0 +1,176 @@
+import copy
+from functools import cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from utils.cache import LRUCache
+
+
+class BaseSessionStore:
+    """
+    Хранилище пользователей действующих сессий.
+    Источником истины остается таблица sessions: хранилище только
+    ускоряет поиск и всегда заполняется после записи в БД.
+    """
+
+    enabled = True
+
+    def __init__(self, ttl: float = 60, **options):
+        self.ttl = ttl
+
+    def get(self, session_id: str):
+        """Вернет пользователя сессии или None."""
+        raise NotImplementedError
+
+    def set(self, session_id: str, user, ttl: float):
+        raise NotImplementedError
+
+    async def aget(self, session_id: str):
+        return await sync_to_async(self.get)(session_id)
+
+    async def aset(self, session_id: str, user, ttl: float):
+        await sync_to_async(self.set)(session_id, user, ttl)
+
+    def delete(self, session_id: str):
+        self.delete_many([session_id])
+
+    def delete_many(self, session_ids):
+        raise NotImplementedError
+
+
+class DatabaseSessionStore(BaseSessionStore):
+    """Без кэширования: каждая сессия ищется в БД."""
+
+    enabled = False
+
+    def get(self, session_id):
+        return None
+
+    def set(self, session_id, user, ttl):
+        pass
+
+    async def aget(self, session_id):
+        return None
+
+    async def aset(self, session_id, user, ttl):
+        pass
+
+    def delete_many(self, session_ids):
+        pass
+
+
+class LocalMemorySessionStore(BaseSessionStore):
+    """
+    LRU-кэш в памяти процесса. Инвалидация не видна другим worker-ам,
+    поэтому TTL ограничивает время жизни закрытой сессии в их кэше.
+    """
+
+    def __init__(self, ttl: float = 60, max_size: int = 10000, **options):
+        super().__init__(ttl=ttl)
+        self._cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def get(self, session_id):
+        user = self._cache.get(session_id)
+        return copy.copy(user) if user is not None else None
+
+    def set(self, session_id, user, ttl):
+        self._cache.set(session_id, user, ttl=ttl)
+
+    async def aget(self, session_id):
+        return self.get(session_id)
+
+    async def aset(self, session_id, user, ttl):
+        self.set(session_id, user, ttl)
+
+    def delete_many(self, session_ids):
+        self._cache.delete_many(session_ids)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class CacheSessionStore(BaseSessionStore):
+    """
+    Общее для всех worker-ов хранилище поверх настроенного в CACHES
+    backend-а (locmem, Redis, memcached). Пользователь кэшируется без
+    полей EXCLUDED_FIELDS: кэш доступен всем его клиентам.
+    """
+
+    EXCLUDED_FIELDS = ('password_hash',)
+
+    def __init__(
+            self,
+            ttl: float = 300,
+            cache_alias: str = 'default',
+            key_prefix: str = 'session:',
+            **options
+    ):
+        super().__init__(ttl=ttl)
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def make_key(self, session_id: str) -> str:
+        return f'{self.key_prefix}{session_id}'
+
+    def get(self, session_id):
+        return self.cache.get(self.make_key(session_id))
+
+    def to_cached(self, user):
+        """
+        Копия user без EXCLUDED_FIELDS; после загрузки из кэша они
+        отложены (deferred) и при обращении читаются из БД.
+        """
+        user = copy.copy(user)
+        for name in self.EXCLUDED_FIELDS:
+            user.__dict__.pop(name, None)
+        return user
+
+    def set(self, session_id, user, ttl):
+        ttl = min(ttl, self.ttl)
+        if ttl > 0:
+            self.cache.set(
+                self.make_key(session_id), self.to_cached(user), timeout=ttl
+            )
+
+    async def aget(self, session_id):
+        return await self.cache.aget(self.make_key(session_id))
+
+    async def aset(self, session_id, user, ttl):
+        ttl = min(ttl, self.ttl)
+        if ttl > 0:
+            await self.cache.aset(
+                self.make_key(session_id), self.to_cached(user), timeout=ttl
+            )
+
+    def delete_many(self, session_ids):
+        keys = [self.make_key(session_id) for session_id in session_ids]
+        if keys:
+            self.cache.delete_many(keys)
+
+
+@cache
+def get_session_store() -> BaseSessionStore:
+    """Вернет хранилище, настроенное в SESSION_STORE."""
+    config = getattr(settings, 'SESSION_STORE', {})
+    backend = import_string(config.get(
+        'BACKEND', 'access.api.session_store.LocalMemorySessionStore'
+    ))
+    options = {
+        key.lower(): value
+        for key, value in config.get('OPTIONS', {}).items()
+    }
+    return backend(**options)
+
+
+@receiver(setting_changed)
+def reset_session_store(setting, **kwargs):
+    if setting in ('SESSION_STORE', 'CACHES'):
+        get_session_store.cache_clear()
@@ -0,0 +1,27 @@
+from access.api.models import (AccessRole, AccessRule, BusinessElement,
+                               Session)
+from access.api.rules import permission_matrix
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from users.models import User
+
+
+@receiver(post_save, sender=AccessRule)
+@receiver(post_delete, sender=AccessRule)
+@receiver(post_save, sender=AccessRole)
+@receiver(post_delete, sender=AccessRole)
+@receiver(post_save, sender=BusinessElement)
+@receiver(post_delete, sender=BusinessElement)
+def reset_permission_matrix(sender, **kwargs):
+    """Сбросит матрицу правил после фиксации изменений."""
+    transaction.on_commit(permission_matrix.invalidate)
+
+
+@receiver(pre_delete, sender=User)
+def revoke_deleted_user_sessions(sender, instance, **kwargs):
+    """
+    Отзовет сессии удаляемого пользователя: иначе его подписанный
+    токен оставался бы действительным до истечения.
+    """
+    Session.invalidate_for_user(instance.pk)
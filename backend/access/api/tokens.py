@@ -0,0 +1,110 @@
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.utils.functional import SimpleLazyObject
+
+SESSION_TOKEN_SALT = 'access.api.session'
+
+
+class SessionToken(NamedTuple):
+    """Содержимое подписанного sessionid."""
+
+    user_id: uuid.UUID
+    role_id: int
+    expire_at: int
+    session_id: str
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expire_at <= time.time()
+
+
+def signed_tokens_enabled() -> bool:
+    """Включен ли режим подписанных токенов (SESSION_TOKENS['SIGNED'])."""
+    return getattr(settings, 'SESSION_TOKENS', {}).get('SIGNED', False)
+
+
+def make_session_token(user_id, role_id, expire_at, session_id) -> str:
+    """Подпишет данные сессии HMAC-ом (SECRET_KEY)."""
+    return signing.dumps(
+        [user_id.hex, role_id, int(expire_at.timestamp()), session_id],
+        salt=SESSION_TOKEN_SALT,
+    )
+
+
+def read_session_token(value: str) -> SessionToken | None:
+    """Вернет содержимое токена или None, если подпись неверна."""
+    try:
+        user_id, role_id, expire_at, session_id = signing.loads(
+            value,
+            salt=SESSION_TOKEN_SALT,
+        )
+        return SessionToken(
+            uuid.UUID(user_id), role_id, expire_at, session_id
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+
+class RevocationList:
+    """
+    Отозванные, но еще не истекшие сессии процесса.
+    Источник истины - таблица sessions: список перечитывается через
+    loader не реже refresh_interval секунд, локальные отзывы видны сразу.
+    """
+
+    def __init__(self, loader, refresh_interval: float = 30):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self._revoked = {}
+        self._next_refresh = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, session_id: str) -> bool:
+        if self.is_stale:
+            self.refresh()
+        return session_id in self._revoked
+
+    async def acontains(self, session_id: str) -> bool:
+        """Асинхронная версия `in`: перечитает список через sync_to_async."""
+        if self.is_stale:
+            await sync_to_async(self.refresh)()
+        return session_id in self._revoked
+
+    @property
+    def is_stale(self) -> bool:
+        return self._next_refresh <= time.monotonic()
+
+    def add(self, session_id: str, expire_at):
+        self._revoked[session_id] = expire_at
+
+    def refresh(self):
+        with self._lock:
+            if self._next_refresh > time.monotonic():
+                return
+            self._revoked = dict(self.loader())
+            self._next_refresh = time.monotonic() + self.refresh_interval
+
+
+class TokenUser(SimpleLazyObject):
+    """
+    Пользователь из подписанного токена.
+    id, role_id, role, is_active и is_admin доступны без запросов к БД,
+    обращение к остальным атрибутам один раз загрузит модель через loader.
+    """
+
+    def __init__(self, token: SessionToken, loader, role=None):
+        super().__init__(loader)
+        self.__dict__.update(
+            id=token.user_id,
+            pk=token.user_id,
+            role_id=token.role_id,
+            role=role,
+            is_active=True,
+            is_admin=role is not None and role.name == 'admin',
+        )
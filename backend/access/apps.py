@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AccessConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'access'
+
+    def ready(self):
+        from access.api import signals  # noqa: F401
+        from access.api.reaper import connect_reaper
+
+        connect_reaper()
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0002_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(condition=models.Q(('is_valid', True)), fields=['session_id', 'expire_at'], include=('user_id',), name='sessions_valid_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['expire_at'], name='sessions_expire_at_idx'),
+        ),
+    ]
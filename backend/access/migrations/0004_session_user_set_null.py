@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0003_session_indexes'),
+        ('users', '0002_user_active_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='session',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='users.user'),
+        ),
+    ]
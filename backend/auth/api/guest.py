@@ -0,0 +1,48 @@
+from access.api.models import AccessRole
+from access.api.rules import permission_matrix
+
+GUEST_ROLE_NAME = 'guest'
+
+
+def get_guest_role() -> AccessRole:
+    """
+    Вернет роль гостя из матрицы правил.
+    Если роли нет в БД, вернет несохраненную роль без правил.
+    """
+    role = permission_matrix.get_role(GUEST_ROLE_NAME)
+    if role is None:
+        role = AccessRole(name=GUEST_ROLE_NAME)
+    return role
+
+
+class GuestUser:
+    """
+    Неаутентифицированный пользователь.
+    Один экземпляр на процесс, роль берется из матрицы правил, поэтому
+    запросы гостей не обращаются к БД.
+    """
+
+    __slots__ = ()
+    _instance = None
+
+    id = None
+    pk = None
+    is_active = False
+    is_admin = False
+    username = 'guest'
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __str__(self):
+        return self.username
+
+    @property
+    def role(self) -> AccessRole:
+        return get_guest_role()
+
+    @property
+    def role_id(self) -> int | None:
+        return get_guest_role().id
@@ -1,42 +1,39 @@
-from access.api.models import AccessRole, Session
-from django.utils import timezone
+from access.api.authentication import aget_session_user, get_session_user
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from auth.api.guest import GuestUser
+from utils.instrumentation import span
 
 
 class SessionAuthenticationMiddleware:
     """Middleware для установки пользователя в request."""
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
         request.user = self._get_user(request)
         return self.get_response(request)
 
+    async def __acall__(self, request):
+        request.user = await self._aget_user(request)
+        return await self.get_response(request)
+
     def _get_user(self, request):
         """Возвращает аутентифицированного пользователя или гостя."""
-        session_id = request.COOKIES.get('sessionid')
-        if session_id:
-            try:
-                session = Session.objects.select_related('user').get(
-                    session_id=session_id,
-                    is_valid=True,
-                    expire_at__gt=timezone.now()
-                )
-                return session.user
-            except Session.DoesNotExist:
-                pass
-
-        return self._create_guest_user()
-
-    def _create_guest_user(self):
-        """Создает гостевого пользователя."""
-        guest_role, created = AccessRole.objects.get_or_create(
-            name='guest',
-        )
-
-        return type('GuestUser', (), {
-            'is_active': False,
-            'role': guest_role,
-            'id': None,
-            'username': 'guest'
-        })()
+        with span('session'):
+            user = get_session_user(request)
+        return GuestUser() if user is None else user
+
+    async def _aget_user(self, request):
+        with span('session'):
+            user = await aget_session_user(request)
+        return GuestUser() if user is None else user
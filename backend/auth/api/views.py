@@ -4,6 +4,7 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from users.api.serializers import UserSerializer
+from users.hashing import PasswordHashingBusyError
 from users.models import User
 
 
@@ -18,7 +19,10 @@ class LoginView(APIView):
         password = serializer.validated_data['password']
 
         try:
-            user = User.objects.get(email=email, is_active=True)
+            user = User.objects.select_related('role').get(
+                email=email,
+                is_active=True
+            )
         except User.DoesNotExist:
             return Response(
                 {'detail': 'Неверный email или пароль.'},
@@ -31,6 +35,13 @@ class LoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                user.save(update_fields=['password_hash'])
+            except PasswordHashingBusyError:
+                pass
+
         session = Session.create_for_user(user)
 
         response = Response({
@@ -40,7 +51,7 @@ class LoginView(APIView):
 
         response.set_cookie(
             key='sessionid',
-            value=session.session_id,
+            value=session.cookie_value,
             expires=session.expire_at,
             httponly=True,
         )
@@ -52,18 +63,20 @@ class LogoutView(APIView):
     """Обработка выхода пользователя."""
 
     def post(self, request):
-        session_id = request.COOKIES.get('sessionid')
+        cookie = request.COOKIES.get('sessionid')
 
-        if not session_id:
+        if not cookie:
             return Response(
                 {'detail': 'Нет активной сессии.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         try:
-            session = Session.objects.get(session_id=session_id, is_valid=True)
-            session.is_valid = False
-            session.save()
+            session = Session.objects.get(
+                session_id=Session.session_id_from_cookie(cookie),
+                is_valid=True
+            )
+            session.invalidate()
         except Session.DoesNotExist:
             return Response(
                 {'detail': 'Сессия недействительна.'},
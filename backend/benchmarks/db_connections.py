@@ -0,0 +1,138 @@
+"""
+Запросы в секунду при разных режимах соединений с БД: новое соединение
+на каждый запрос, постоянные соединения (CONN_MAX_AGE) и пул psycopg 3.
+
+Нужен Postgres из config.settings (переменные DB_*). Данные создаются в
+тестовой БД test_<DB_NAME>, которая удаляется после замера. Запросы идут
+прямо в WSGI-приложение: django.test.Client отключает закрытие соединений
+по сигналам запроса, и CONN_MAX_AGE=0 не имел бы эффекта.
+
+    cd backend && python -m benchmarks.db_connections [--requests N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from http.cookies import SimpleCookie
+
+MODES = {
+    'per-request': {'DB_CONN_MAX_AGE': '0', 'DB_POOL_MAX_SIZE': '0'},
+    'persistent': {'DB_CONN_MAX_AGE': '60', 'DB_POOL_MAX_SIZE': '0'},
+    'pool': {'DB_POOL_MAX_SIZE': '4'},
+}
+
+
+def call_wsgi(application, environ: dict) -> tuple[int, list]:
+    """Выполнит запрос; close() ответа отправит request_finished."""
+    started = []
+
+    def start_response(status, headers, exc_info=None):
+        started.append((int(status[:3]), headers))
+
+    response = application(environ, start_response)
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return started[0]
+
+
+def measure(requests: int) -> dict:
+    """Выполняется в отдельном процессе с настройками режима."""
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import RequestFactory
+    from users.models import User
+
+    test_db = connection.creation.create_test_db(verbosity=0)
+    try:
+        call_command('create_test_data', verbosity=0)
+        application = get_wsgi_application()
+        status, headers = call_wsgi(application, RequestFactory().post(
+            '/api/auth/login/',
+            {'email': 'admin@example.com', 'password': 'adminpass'},
+            content_type='application/json',
+        ).environ)
+        assert status == 200, status
+        cookies = SimpleCookie()
+        for name, value in headers:
+            if name == 'Set-Cookie':
+                cookies.load(value)
+        path = f'/api/users/{User.objects.get(email="user@example.com").id}/'
+        environ = RequestFactory(
+            HTTP_COOKIE=f'sessionid={cookies["sessionid"].value}'
+        ).get(path).environ
+        for _ in range(50):
+            call_wsgi(application, dict(environ))
+
+        connections_opened = []
+        connection_created.connect(
+            lambda **kwargs: connections_opened.append(1), weak=False
+        )
+        start = time.perf_counter()
+        for _ in range(requests):
+            status, _ = call_wsgi(application, dict(environ))
+        elapsed = time.perf_counter() - start
+        assert status == 200, status
+    finally:
+        connection.creation.destroy_test_db(test_db, verbosity=0)
+
+    return {
+        'rps': requests / elapsed,
+        'ms': elapsed / requests * 1000,
+        'connections': len(connections_opened),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--settings', default='config.settings')
+    parser.add_argument(
+        '--worker', action='store_true', help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.requests)))
+        return
+
+    try:
+        import psycopg_pool  # noqa: F401
+        modes = MODES
+    except ImportError:
+        print('psycopg_pool не установлен, режим pool пропущен.')
+        modes = {k: v for k, v in MODES.items() if k != 'pool'}
+
+    print(f'{"режим":<14}{"запросов/сек":>14}{"мс на запрос":>14}'
+          f'{"соединений":>12}')
+    for mode, env in modes.items():
+        output = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.db_connections',
+                '--worker', '--requests', str(args.requests),
+            ],
+            env={
+                **os.environ,
+                **env,
+                'DJANGO_SETTINGS_MODULE': args.settings,
+            },
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f'{mode:<14}{result["rps"]:>14.1f}{result["ms"]:>14.2f}'
+              f'{result["connections"]:>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Сравнение полного (config.settings) и облегченного (config.settings_lean)
+профилей: время запуска, число загруженных модулей и задержка запроса
+через весь стек middleware.
+
+    cd backend && python -m benchmarks.middleware_stack [--requests N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROFILES = {
+    'full': 'config.settings',
+    'lean': 'config.settings_lean',
+}
+
+STARTUP_CODE = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'modules': len(sys.modules),
+}))
+'''
+
+
+def run_python(profile: str, *args) -> dict:
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'benchmarks.settings',
+        'BENCHMARK_SETTINGS': PROFILES[profile],
+    }
+    output = subprocess.run(
+        [sys.executable, *args],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def measure_startup(profile: str, runs: int) -> dict:
+    results = [run_python(profile, '-c', STARTUP_CODE) for _ in range(runs)]
+    return {
+        'startup_ms': statistics.median(r['seconds'] for r in results) * 1000,
+        'modules': results[-1]['modules'],
+    }
+
+
+def measure_requests(path: str, requests: int) -> dict:
+    """Выполняется в отдельном процессе с нужным профилем."""
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test import Client
+
+    call_command('migrate', verbosity=0)
+    client = Client()
+    for _ in range(50):
+        client.get(path)
+
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    timings.sort()
+    return {
+        'median_us': statistics.median(timings),
+        'p95_us': timings[int(len(timings) * 0.95)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--path', default='/mock/products/')
+    parser.add_argument(
+        '--worker', action='store_true', help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure_requests(args.path, args.requests)))
+        return
+
+    results = {}
+    for profile in PROFILES:
+        results[profile] = {
+            **measure_startup(profile, args.startup_runs),
+            **run_python(
+                profile, '-m', 'benchmarks.middleware_stack', '--worker',
+                '--requests', str(args.requests), '--path', args.path,
+            ),
+        }
+
+    print(f'{"profile":<8}{"startup, ms":>14}{"modules":>10}'
+          f'{"median, us":>13}{"p95, us":>11}')
+    for profile, result in results.items():
+        print(f'{profile:<8}{result["startup_ms"]:>14.1f}'
+              f'{result["modules"]:>10}{result["median_us"]:>13.1f}'
+              f'{result["p95_us"]:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
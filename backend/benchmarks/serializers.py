@@ -0,0 +1,92 @@
+"""
+Сравнение сериализации списка пользователей: DRF UserSerializer по
+объектам .only() и UserRowSerializer по .values(). Время включает выборку
+из БД и сериализацию; вывод проверяется на побайтовое совпадение.
+
+    cd backend && python -m benchmarks.serializers [--rows 1000 10000]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import uuid
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+
+def create_users(start: int, stop: int):
+    from access.api.models import AccessRole
+    from users.models import User
+
+    role, _ = AccessRole.objects.get_or_create(name='user')
+    User.objects.bulk_create(
+        (
+            User(
+                id=uuid.uuid4(),
+                email=f'bench{index}@example.com',
+                password_hash='!',
+                last_name='Иванов',
+                first_name='Иван',
+                patronymic='Иванович' if index % 2 else '',
+                role=role,
+            )
+            for index in range(start, stop)
+        ),
+        batch_size=5000,
+    )
+
+
+def measure(func, repeat: int) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = json.dumps(func(), ensure_ascii=False).encode('utf-8')
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--rows', type=int, nargs='+', default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from users.api.serializers import UserRowSerializer, UserSerializer
+    from users.models import User
+
+    call_command('migrate', verbosity=0)
+    columns = UserSerializer.model_fields(None)
+    paths = {
+        'drf': lambda qs: UserSerializer(
+            qs.only(*columns), many=True
+        ).data,
+        'fast': lambda qs: UserRowSerializer().many(qs.values(*columns)),
+    }
+
+    print(f'{"rows":>8}{"drf, ms":>12}{"fast, ms":>12}{"speedup":>10}')
+    created = 0
+    for rows in sorted(args.rows):
+        create_users(created, rows)
+        created = rows
+        queryset = User.objects.order_by('created_at', 'id')[:rows]
+
+        results = {
+            name: measure(lambda: path(queryset), args.repeat)
+            for name, path in paths.items()
+        }
+        if results['drf'][1] != results['fast'][1]:
+            raise SystemExit(f'Вывод различается на {rows} строках.')
+
+        drf, fast = results['drf'][0], results['fast'][0]
+        print(f'{rows:>8}{drf:>12.1f}{fast:>12.1f}{drf / fast:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Настройки для бенчмарков: профиль из BENCHMARK_SETTINGS поверх SQLite.
+
+    BENCHMARK_SETTINGS=config.settings_lean \
+    DJANGO_SETTINGS_MODULE=benchmarks.settings python ...
+"""
+import os
+from importlib import import_module
+
+_profile = import_module(
+    os.environ.get('BENCHMARK_SETTINGS', 'config.settings')
+)
+globals().update(
+    (name, value) for name, value in vars(_profile).items()
+    if name.isupper()
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = ['testserver']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BENCHMARK_DB_NAME', ':memory:'),
+    }
+}
+
+# INCLUDE-колонки индексов есть только в Postgres.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
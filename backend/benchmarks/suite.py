@@ -0,0 +1,254 @@
+"""
+Набор бенчмарков горячих путей аутентификации и авторизации: логин,
+детальная информация и списки пользователей, гость на mock/products,
+check_access с правилами и без, список правил для админа.
+
+Для каждого сценария выводятся перцентили задержки и число SQL-запросов
+на запрос. Результаты можно сохранить и сравнить с сохраненными:
+
+    cd backend && python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json
+
+По умолчанию - SQLite в памяти (benchmarks.settings, профиль из
+BENCHMARK_SETTINGS). Для локального Postgres: --settings config.settings
+(переменные DB_*), данные создаются в тестовой БД и удаляются.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(timings: list, value: int) -> float:
+    """Перцентиль по ближайшему рангу; timings отсортированы."""
+    index = max(0, -(-len(timings) * value // 100) - 1)
+    return timings[index]
+
+
+def measure(func, requests: int, warmup: int) -> dict:
+    from utils.instrumentation import finish_profile, start_profile
+
+    for _ in range(warmup):
+        func()
+    token = start_profile()
+    try:
+        func()
+    finally:
+        profile = finish_profile(token)
+
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    return {
+        'requests': requests,
+        'mean_ms': statistics.fmean(timings),
+        **{
+            f'p{value}_ms': percentile(timings, value)
+            for value in PERCENTILES
+        },
+        'queries': profile.queries,
+    }
+
+
+def login(client, email: str, password: str):
+    response = client.post(
+        '/api/auth/login/',
+        {'email': email, 'password': password},
+        content_type='application/json',
+    )
+    assert response.status_code == 200, response.content
+
+
+def expect(client, path: str, status: int = 200):
+    def request():
+        response = client.get(path)
+        assert response.status_code == status, (path, response.status_code)
+    return request
+
+
+def check_access_scenarios(user) -> dict:
+    """check_access на пустом view: с правилами ресурса и без них."""
+    from access.api.permissions import check_access
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    def view(request):
+        return HttpResponse()
+
+    request = RequestFactory().get('/')
+    request.user = user
+    with_rules = check_access(['GET'], get_rules_for='user')(view)
+    without_rules = check_access(['GET'])(view)
+    return {
+        'check_access_rules': lambda: with_rules(request),
+        'check_access_no_rules': lambda: without_rules(request),
+    }
+
+
+def build_scenarios(options) -> dict:
+    from django.test import Client
+    from users.models import User
+
+    admin = Client()
+    login(admin, 'admin@example.com', 'adminpass')
+    user = Client()
+    login(user, 'user@example.com', 'userpass')
+    guest = Client()
+    user_id = User.objects.get(email='user@example.com').id
+
+    scenarios = {
+        'login': (
+            lambda: login(Client(), 'user@example.com', 'userpass'),
+            options.login_requests,
+        ),
+        'user_detail': (expect(user, f'/api/users/{user_id}/'), None),
+        **{
+            f'user_list_{size}': (
+                expect(admin, f'/api/users/?limit={size}'), None
+            )
+            for size in options.list_sizes
+        },
+        'guest_products': (expect(guest, '/mock/products/'), None),
+        'admin_rules_list': (expect(admin, '/api/access/rules/'), None),
+    }
+    scenarios.update(
+        (name, (func, None)) for name, func in check_access_scenarios(
+            User.objects.select_related('role').get(
+                email='user@example.com'
+            )
+        ).items()
+    )
+    return scenarios
+
+
+def run(options) -> dict:
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+    from utils.instrumentation import enable_query_recording
+
+    enable_query_recording()
+    test_db = connection.creation.create_test_db(verbosity=0)
+    try:
+        call_command(
+            'create_test_data',
+            users=max(options.list_sizes),
+            stdout=open(os.devnull, 'w'),
+        )
+        results = {}
+        for name, (func, requests) in build_scenarios(options).items():
+            if options.only and name not in options.only:
+                continue
+            results[name] = measure(
+                func, requests or options.requests, options.warmup
+            )
+    finally:
+        connection.creation.destroy_test_db(test_db, verbosity=0)
+    return results
+
+
+def metadata(options) -> dict:
+    import django
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+        'profile': os.environ.get('BENCHMARK_SETTINGS', 'config.settings'),
+        'requests': options.requests,
+    }
+
+
+def print_results(results: dict):
+    columns = ('mean_ms', *(f'p{value}_ms' for value in PERCENTILES))
+    print(f'{"сценарий":<24}' + ''.join(f'{c:>11}' for c in columns)
+          + f'{"запросов":>10}')
+    for name, result in results.items():
+        print(f'{name:<24}'
+              + ''.join(f'{result[c]:>11.3f}' for c in columns)
+              + f'{result["queries"]:>10}')
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Выведет изменения относительно baseline; True, если есть регрессии."""
+    regressed = False
+    print(f'\nСравнение с {baseline["meta"].get("commit")} '
+          f'(порог {threshold:.0%}):')
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if old is None:
+            print(f'{name:<24} нет в baseline')
+            continue
+        change = result['p50_ms'] / old['p50_ms'] - 1
+        queries = result['queries'] - old['queries']
+        marks = []
+        if change > threshold:
+            marks.append('медленнее')
+        if queries > 0:
+            marks.append('больше SQL')
+        regressed |= bool(marks)
+        print(f'{name:<24} p50 {change:>+8.1%}  SQL {queries:>+3}  '
+              f'{", ".join(marks) or "ok"}')
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--login-requests', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument(
+        '--list-sizes', type=int, nargs='+', default=[10, 100, 1000]
+    )
+    parser.add_argument('--only', nargs='+', help='Только эти сценарии.')
+    parser.add_argument('--settings', default='benchmarks.settings')
+    parser.add_argument('--output', help='Сохранить результаты в JSON.')
+    parser.add_argument('--compare', help='JSON с предыдущими результатами.')
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='Допустимое замедление p50 при --compare (0.2 = 20%%).',
+    )
+    options = parser.parse_args()
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = options.settings
+    results = run(options)
+    print_results(results)
+
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(
+                {'meta': metadata(options), 'results': results},
+                file, indent=2, ensure_ascii=False,
+            )
+
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, options.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
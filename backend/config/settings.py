@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'access.api.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -31,13 +33,106 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
+    'utils.middleware.PrimaryStickinessMiddleware',
     'auth.api.middleware.SessionAuthenticationMiddleware',
     'access.api.middleware.ErrorHandlerMiddleware',
+    'access.api.middleware.AsyncViewMiddleware',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [],
     'DEFAULT_PERMISSION_CLASSES': [],
+    'UNAUTHENTICATED_USER': 'auth.api.guest.GuestUser',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Для нескольких worker-ов:
+    # 'default': {
+    #     'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    #     'LOCATION': 'redis://127.0.0.1:6379',
+    # },
+}
+
+# Хранилище сессий перед таблицей sessions (см. Session.get_active_user).
+# access.api.session_store.CacheSessionStore делит сессии между worker-ами
+# через CACHES, DatabaseSessionStore отключает кэширование.
+SESSION_STORE = {
+    'BACKEND': 'access.api.session_store.LocalMemorySessionStore',
+    'OPTIONS': {
+        'MAX_SIZE': 10000,
+        'TTL': 60,
+    },
+}
+
+# SIGNED: sessionid содержит подписанный токен (user, роль, срок,
+# session_id), который проверяется без запросов к БД. Отозванные сессии
+# перечитываются из таблицы sessions раз в REVOCATION_REFRESH секунд.
+SESSION_TOKENS = {
+    'SIGNED': False,
+    'REVOCATION_REFRESH': 30,
+}
+
+# Фоновая очистка таблицы sessions (access.api.reaper): раз в INTERVAL
+# секунд удаляет истекшие/отозванные сессии пачками по BATCH_SIZE с паузой
+# BATCH_DELAY, не больше MAX_BATCHES пачек (None - без ограничения).
+# Поток стартует с первым запросом процесса, проход в Postgres выполняет
+# один процесс (advisory lock). Вместо потока можно запускать из cron:
+# python manage.py purge_sessions
+SESSION_REAPER = {
+    'ENABLED': False,
+    'INTERVAL': 300,
+    'BATCH_SIZE': 1000,
+    'BATCH_DELAY': 0.1,
+    'MAX_BATCHES': None,
+}
+
+# Профилирование запросов (utils.instrumentation): время, число SQL и
+# участки session/rules/object_access/hashing/serialize по view.
+# Агрегаты процесса - GET /metrics/ (Prometheus), по запросу - заголовок
+# Server-Timing (SERVER_TIMING).
+INSTRUMENTATION = {
+    'ENABLED': False,
+    'SERVER_TIMING': True,
+}
+
+# Матрица правил доступа в памяти процесса (access.api.rules). Изменения
+# в этом процессе применяются сразу, из других - не позже TTL секунд.
+ACCESS_RULES_CACHE = {
+    'TTL': 60,
+}
+
+# Политика хэширования паролей (users.hashing). ALGORITHM: 'bcrypt' или
+# 'argon2' (нужен argon2-cffi). OPTIONS: ROUNDS для bcrypt; TIME_COST,
+# MEMORY_COST, PARALLELISM для argon2. Хэши со старыми параметрами
+# пересчитываются при успешном входе. Подбор стоимости:
+# python manage.py benchmark_hashing
+PASSWORD_HASHING = {
+    'ALGORITHM': 'bcrypt',
+    'OPTIONS': {
+        'ROUNDS': 12,
+    },
+}
+
+# Пул хэширования паролей (users.hashing): EXECUTOR - 'thread',
+# 'process' или None (в потоке запроса). При заполнении
+# MAX_WORKERS + QUEUE_SIZE мест логин/регистрация получают 503 с
+# Retry-After.
+PASSWORD_HASHING_POOL = {
+    'EXECUTOR': 'thread',
+    'MAX_WORKERS': 4,
+    'QUEUE_SIZE': 32,
+    'RETRY_AFTER': 1,
+}
+
+# Сериализация ответов чтения по имени url: True - UserRowSerializer
+# по .values() (быстро), False - DRF UserSerializer. Вывод одинаковый.
+FAST_SERIALIZERS = {
+    'user-list': True,
+    'user-detail': True,
+    'user-export': True,
 }
 
 ROOT_URLCONF = 'config.urls'
@@ -59,17 +154,63 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Подключение к БД из переменных окружения DB_*.
+# DB_CONN_MAX_AGE - сколько секунд держать соединение между запросами
+# (0 - новое на каждый запрос), DB_CONN_HEALTH_CHECKS=1 проверяет его
+# перед повторным использованием. DB_POOL_MAX_SIZE > 0 включает пул
+# psycopg 3 (pip install "psycopg[pool]") вместо постоянных соединений.
+# Пул свой в каждом процессе-воркере: воркеры * DB_POOL_MAX_SIZE должно
+# быть меньше max_connections в Postgres.
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'auth_db',
-        'USER': 'postgres',
-        'PASSWORD': 'password',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'NAME': os.environ.get('DB_NAME', 'auth_db'),
+        'USER': os.environ.get('DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', 'password'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': (
+            0 if DB_POOL_MAX_SIZE
+            else int(os.environ.get('DB_CONN_MAX_AGE', 60))
+        ),
+        'CONN_HEALTH_CHECKS': (
+            os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1'
+        ),
+        'OPTIONS': {},
     }
 }
 
+if DB_POOL_MAX_SIZE:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 1)),
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    }
+
+# Реплики для чтения (utils.db.ReplicaRouter): ALIASES из DATABASES.
+# Клиент, который что-то записал, еще STICKY_SECONDS секунд читает из
+# default (PrimaryStickinessMiddleware). DB_REPLICA_HOST добавляет
+# реплику с параметрами default.
+READ_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': 5,
+}
+
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get(
+            'DB_REPLICA_PORT', DATABASES['default']['PORT']
+        ),
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_REPLICAS['ALIASES'] = ['replica']
+
+DATABASE_ROUTERS = ['utils.db.ReplicaRouter']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -0,0 +1,44 @@
+"""
+Облегченный профиль настроек.
+
+Проект не использует аутентификацию, сессии и сообщения Django, поэтому
+здесь отключены django.contrib.admin/auth/sessions/messages/staticfiles и
+их middleware. Пользователя в request устанавливает
+SessionAuthenticationMiddleware.
+
+Запуск: DJANGO_SETTINGS_MODULE=config.settings_lean
+"""
+from config.settings import *  # noqa: F401,F403
+from config.settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'rest_framework',
+
+    'users.apps.UsersConfig',
+    'access.apps.AccessConfig',
+    'utils.apps.UtilsConfig'
+]
+
+MIDDLEWARE = [
+    'access.api.middleware.InstrumentationMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+
+    'utils.middleware.PrimaryStickinessMiddleware',
+    'auth.api.middleware.SessionAuthenticationMiddleware',
+    'access.api.middleware.ErrorHandlerMiddleware',
+    'access.api.middleware.AsyncViewMiddleware',
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+}
+
+TEMPLATES = []
+
+AUTH_PASSWORD_VALIDATORS = []
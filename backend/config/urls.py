@@ -1,8 +1,10 @@
 from django.urls import include, path
+from utils.views import metrics_view
 
 urlpatterns = [
     path('api/auth/', include('auth.api.urls')),
     path('api/users/', include('users.api.urls')),
     path('api/access/', include('access.api.urls')),
     path('mock/', include('mock.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 ]
@@ -1,16 +1,10 @@
 from access.api.permissions import check_access
-from django.http import JsonResponse
+from utils.codec import JsonResponse
+from utils.views import async_variant
 
 
-@check_access(
-    allowed_methods=['GET'],
-    require_auth=False
-)
-def get_products(request):
-    """
-    Mock API для получения списка товаров.
-    Публичный endpoint - не требует аутентификации.
-    """
+def products_response(request):
+    """Ответ get_products; не обращается к БД, как и orders_response."""
     mock_products = [
         {
             'id': 1,
@@ -35,16 +29,7 @@ def get_products(request):
     return JsonResponse({'products': mock_products})
 
 
-@check_access(
-    allowed_methods=['GET'],
-    get_rules_for='order',
-    require_auth=True
-)
-def get_orders(request):
-    """
-    Mock API для получения заказов.
-    Требует аутентификацию и права на чтение заказов (своих или любых).
-    """
+def orders_response(request):
     mock_orders = [
         {
             'id': 101,
@@ -79,3 +64,47 @@ def get_orders(request):
         {'error': 'Нет доступа к заказам.'},
         status=403
     )
+
+
+@check_access(
+    allowed_methods=['GET'],
+    require_auth=False
+)
+def get_products(request):
+    """
+    Mock API для получения списка товаров.
+    Публичный endpoint - не требует аутентификации.
+    """
+    return products_response(request)
+
+
+@async_variant(get_products)
+@check_access(
+    allowed_methods=['GET'],
+    require_auth=False
+)
+async def aget_products(request):
+    return products_response(request)
+
+
+@check_access(
+    allowed_methods=['GET'],
+    get_rules_for='order',
+    require_auth=True
+)
+def get_orders(request):
+    """
+    Mock API для получения заказов.
+    Требует аутентификацию и права на чтение заказов (своих или любых).
+    """
+    return orders_response(request)
+
+
+@async_variant(get_orders)
+@check_access(
+    allowed_methods=['GET'],
+    get_rules_for='order',
+    require_auth=True
+)
+async def aget_orders(request):
+    return orders_response(request)
@@ -1,5 +1,8 @@
+from operator import itemgetter
+
 from rest_framework import serializers
 from users.models import User
+from utils.utils import ValidationError
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
@@ -22,9 +25,60 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserImportSerializer(UserRegisterSerializer):
+    """
+    Строка массового импорта. Уникальность email и существование роли
+    проверяются для всей пачки сразу (users.importer), а не по строке.
+    """
+
+    role = serializers.CharField(required=False, allow_blank=True)
+
+    class Meta(UserRegisterSerializer.Meta):
+        fields = UserRegisterSerializer.Meta.fields + ('role',)
+        extra_kwargs = {'email': {'validators': []}}
+
+
 class UserSerializer(serializers.ModelSerializer):
+    """
+    Пользователь. fields ограничивает набор полей ответа
+    (sparse fieldset), model_fields подскажет колонки для .only().
+    """
+
     full_name = serializers.ReadOnlyField()
 
+    SOURCE_FIELDS = {
+        'full_name': ('last_name', 'first_name', 'patronymic'),
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def parse_fields(cls, value: str | None) -> tuple | None:
+        """Разберет параметр fields=a,b,c. Неизвестные поля - ошибка."""
+        if not value:
+            return None
+        fields = tuple(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        unknown = set(fields) - set(cls.Meta.fields)
+        if unknown:
+            raise ValidationError(
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+            )
+        return fields
+
+    @classmethod
+    def model_fields(cls, fields: tuple | None) -> tuple:
+        """Колонки модели, нужные для вывода fields."""
+        names = []
+        for name in fields or cls.Meta.fields:
+            names.extend(cls.SOURCE_FIELDS.get(name, (name,)))
+        return tuple(dict.fromkeys(names))
+
     class Meta:
         model = User
         fields = (
@@ -40,6 +94,59 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'is_active', 'role')
 
 
+def _full_name(row: dict) -> str:
+    parts = [row['last_name'], row['first_name']]
+    if row['patronymic']:
+        parts.append(row['patronymic'])
+    return ' '.join(parts)
+
+
+def _optional_str(name: str):
+    def getter(row: dict):
+        value = row[name]
+        return None if value is None else str(value)
+    return getter
+
+
+class UserRowSerializer:
+    """
+    Быстрая замена UserSerializer только для чтения: переводит строки
+    .values() в словари, совпадающие с UserSerializer(...).data, без
+    построения полей DRF. Функции полей выбираются один раз в __init__.
+    """
+
+    __slots__ = ('fields', 'columns', '_getters')
+
+    GETTERS = {
+        'id': _optional_str('id'),
+        'full_name': _full_name,
+    }
+
+    def __init__(self, fields: tuple | None = None):
+        self.fields = fields or UserSerializer.Meta.fields
+        self.columns = UserSerializer.model_fields(self.fields)
+        self._getters = tuple(
+            (name, self.GETTERS.get(name, itemgetter(name)))
+            for name in self.fields
+        )
+
+    def to_representation(self, row: dict) -> dict:
+        return {name: getter(row) for name, getter in self._getters}
+
+    def many(self, rows) -> list:
+        getters = self._getters
+        return [
+            {name: getter(row) for name, getter in getters} for row in rows
+        ]
+
+    def from_instance(self, user: User) -> dict:
+        """Сериализует объект модели (role берется как role_id)."""
+        return self.to_representation({
+            column: getattr(user, 'role_id' if column == 'role' else column)
+            for column in self.columns
+        })
+
+
 class UserUpdateSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
 
@@ -61,3 +168,23 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             instance.set_password(password)
         instance.save()
         return instance
+
+
+class UserBulkUpdateSerializer(serializers.ModelSerializer):
+    """
+    Изменения одного пользователя в массовом обновлении. Уникальность
+    email проверяется для всего списка одним запросом.
+    """
+
+    id = serializers.UUIDField()
+
+    class Meta:
+        model = User
+        fields = (
+            'id',
+            'last_name',
+            'first_name',
+            'patronymic',
+            'email',
+        )
+        extra_kwargs = {'email': {'validators': []}}
@@ -4,7 +4,11 @@ from . import views
 
 urlpatterns = [
     path('register/', views.register_user, name='user-register'),
+    path('import/', views.import_users_view, name='user-import'),
     path('', views.get_user_list, name='user-list'),
+    path('export/', views.export_users, name='user-export'),
+    path('bulk/update/', views.bulk_update_users, name='user-bulk-update'),
+    path('bulk/delete/', views.bulk_delete_users, name='user-bulk-delete'),
     path('<uuid:user_id>/', views.get_user_detail, name='user-detail'),
     path('<uuid:user_id>/update/', views.update_user, name='user-update'),
     path('<uuid:user_id>/delete/', views.delete_user, name='user-delete'),
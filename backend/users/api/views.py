@@ -1,14 +1,38 @@
 import uuid
 
 from access.api.constants import Action
+from access.api.models import Session
 from access.api.permissions import check_access, check_object_access
-from django.http import HttpRequest, JsonResponse
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
-from users.api.serializers import (UserRegisterSerializer, UserSerializer,
-                                   UserUpdateSerializer)
+from users.api.serializers import (UserBulkUpdateSerializer,
+                                   UserRegisterSerializer, UserRowSerializer,
+                                   UserSerializer, UserUpdateSerializer)
+from users.importer import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, import_users
 from users.models import User
-from utils.utils import parse_json_body
+from utils.codec import JsonResponse
+from utils.instrumentation import span
+from utils.pagination import paginate_keyset, parse_limit, split_page
+from utils.streaming import STREAM_FORMATS, aiter_json, iter_json
+from utils.utils import ValidationError, parse_json_body
+from utils.views import async_variant
+
+USER_ORDERING = ('created_at', 'id')
+USER_PAGE_SIZE = 100
+USER_PAGE_SIZE_MAX = 1000
+USER_EXPORT_CHUNK_SIZE = 2000
+USER_IMPORT_CHUNK_SIZE_MAX = 10000
+USER_BULK_MAX = 10000
+
+
+def use_fast_serializer(url_name: str) -> bool:
+    """Включен ли UserRowSerializer для view (settings.FAST_SERIALIZERS)."""
+    return getattr(settings, 'FAST_SERIALIZERS', {}).get(url_name, False)
 
 
 @csrf_exempt
@@ -64,20 +88,185 @@ def register_user(request: HttpRequest) -> JsonResponse:
         )
 
 
+@csrf_exempt
+@check_access(
+    allowed_methods=['POST'],
+    require_admin=True
+)
+def import_users_view(request: HttpRequest) -> JsonResponse:
+    """
+    Массовый импорт пользователей (админ).
+
+    Тело - NDJSON (Content-Type: application/x-ndjson) или CSV с
+    заголовком (text/csv) с полями email, password, last_name,
+    first_name, patronymic, role. Тело читается построчно, без загрузки
+    в память целиком.
+
+    Параметры запроса:
+        chunk_size: строк в пачке (по умолчанию 1000)
+
+    Returns:
+        JsonResponse: {'created': N, 'errors': [{'row': n, 'errors': ...}]}
+    """
+    import_format = IMPORT_FORMATS.get(request.content_type)
+    if import_format is None:
+        return JsonResponse(
+            {'error': 'Требуется Content-Type: application/x-ndjson '
+                      'или text/csv'},
+            status=415
+        )
+    chunk_size = parse_limit(
+        request.GET.get('chunk_size'),
+        IMPORT_CHUNK_SIZE,
+        USER_IMPORT_CHUNK_SIZE_MAX,
+        name='chunk_size'
+    )
+
+    result = import_users(request, import_format, chunk_size)
+    return JsonResponse(result.as_dict())
+
+
+def user_list_query(request: HttpRequest):
+    """Queryset страницы get_user_list и параметры для user_list_response."""
+    fields = UserSerializer.parse_fields(request.GET.get('fields'))
+    fast = use_fast_serializer('user-list')
+
+    limit = parse_limit(
+        request.GET.get('limit'), USER_PAGE_SIZE, USER_PAGE_SIZE_MAX
+    )
+    columns = (*USER_ORDERING, *UserSerializer.model_fields(fields))
+    users = User.objects.filter(is_active=True).for_user(
+        request.user, Action.READ, request.access_rules
+    )
+    users = users.values(*columns) if fast else users.only(*columns)
+    queryset = paginate_keyset(
+        users,
+        USER_ORDERING,
+        request.GET.get('cursor'),
+        limit
+    )
+    return queryset, fields, fast, limit
+
+
+def user_list_response(
+        users: list,
+        fields,
+        fast: bool,
+        limit: int
+) -> JsonResponse:
+    users, next_cursor = split_page(users, USER_ORDERING, limit)
+    with span('serialize'):
+        if fast:
+            data = UserRowSerializer(fields).many(users)
+        else:
+            data = UserSerializer(users, many=True, fields=fields).data
+    return JsonResponse({'users': data, 'next_cursor': next_cursor})
+
+
 @csrf_exempt
 @check_access(
     allowed_methods=['GET'],
     get_rules_for='user',
 )
 def get_user_list(request: HttpRequest) -> JsonResponse:
-    """Выдаст список всех пользователей или вернет текущего."""
-    if request.access_rules.can_read_all:
-        users = User.objects.filter(is_active=True)
-        data = UserSerializer(users, many=True).data
-        return JsonResponse({'users': data})
+    """
+    Выдаст страницу доступных пользователей: всех при can_read_all,
+    только текущего при can_read_own.
+
+    Параметры запроса:
+        limit: размер страницы (по умолчанию 100, максимум 1000)
+        cursor: next_cursor из предыдущего ответа
+        fields: поля через запятую, например fields=id,email
+
+    Страницы упорядочены по (created_at, id) и выбираются одним
+    запросом по ключу, без OFFSET.
+    """
+    queryset, *params = user_list_query(request)
+    return user_list_response(list(queryset), *params)
+
+
+@async_variant(get_user_list)
+@check_access(
+    allowed_methods=['GET'],
+    get_rules_for='user',
+)
+async def aget_user_list(request: HttpRequest) -> JsonResponse:
+    queryset, *params = user_list_query(request)
+    return user_list_response([user async for user in queryset], *params)
+
+
+@csrf_exempt
+@check_access(
+    allowed_methods=['GET'],
+    get_rules_for='user',
+)
+def export_users(request: HttpRequest) -> StreamingHttpResponse:
+    """
+    Потоковая выгрузка пользователей.
+
+    Строки читаются серверным курсором (.iterator) порциями по
+    USER_EXPORT_CHUNK_SIZE и сразу отдаются клиенту, поэтому память не
+    зависит от размера таблицы. Набор пользователей - как в
+    get_user_list.
+
+    Параметры запроса:
+        format: ndjson (по умолчанию) или json
+        fields: поля через запятую, как в get_user_list
+    """
+    stream_format = request.GET.get('format', 'ndjson')
+    if stream_format not in STREAM_FORMATS:
+        raise ValidationError('format должен быть ndjson или json.')
+    fields = UserSerializer.parse_fields(request.GET.get('fields'))
+
+    users = User.objects.filter(is_active=True).for_user(
+        request.user, Action.READ, request.access_rules
+    )
+    columns = UserSerializer.model_fields(fields)
+    if use_fast_serializer('user-export'):
+        users = users.values(*columns)
+        serializer = UserRowSerializer(fields)
+    else:
+        users = users.only(*columns)
+        serializer = UserSerializer(fields=fields)
+    users = users.order_by(*USER_ORDERING)
+
+    if isinstance(request, ASGIRequest):
+        async def rows():
+            async for user in users.aiterator(
+                    chunk_size=USER_EXPORT_CHUNK_SIZE
+            ):
+                yield serializer.to_representation(user)
+
+        content = aiter_json(rows(), stream_format)
     else:
-        data = UserSerializer(request.user).data
-        return JsonResponse({'users': [data]})
+        content = iter_json(
+            (
+                serializer.to_representation(user)
+                for user in users.iterator(chunk_size=USER_EXPORT_CHUNK_SIZE)
+            ),
+            stream_format
+        )
+
+    response = StreamingHttpResponse(
+        content,
+        content_type=STREAM_FORMATS[stream_format]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="users.{stream_format}"'
+    )
+    return response
+
+
+def user_detail_response(request: HttpRequest, user: User) -> JsonResponse:
+    check_object_access(
+        request.user, user, request.access_rules, Action.READ
+    )
+    with span('serialize'):
+        if use_fast_serializer('user-detail'):
+            data = UserRowSerializer().from_instance(user)
+        else:
+            data = UserSerializer(user).data
+    return JsonResponse({'user': data})
 
 
 @csrf_exempt
@@ -87,12 +276,23 @@ def get_user_list(request: HttpRequest) -> JsonResponse:
 )
 def get_user_detail(request: HttpRequest, user_id: uuid.UUID) -> JsonResponse:
     """Выдаст информацию о пользователе."""
-    user_to_read = get_object_or_404(User, id=user_id, is_active=True)
-    check_object_access(
-        request.user, user_to_read, request.access_rules, Action.READ
+    return user_detail_response(
+        request, get_object_or_404(User, id=user_id, is_active=True)
+    )
+
+
+@async_variant(get_user_detail)
+@check_access(
+    allowed_methods=['GET'],
+    get_rules_for='user',
+)
+async def aget_user_detail(
+        request: HttpRequest,
+        user_id: uuid.UUID
+) -> JsonResponse:
+    return user_detail_response(
+        request, await aget_object_or_404(User, id=user_id, is_active=True)
     )
-    data = UserSerializer(user_to_read).data
-    return JsonResponse({'user': data})
 
 
 @csrf_exempt
@@ -156,3 +356,148 @@ def delete_user(request: HttpRequest, user_id: uuid.UUID) -> JsonResponse:
     return JsonResponse(
         {'message': 'Пользователь удалён.'}
     )
+
+
+def parse_bulk_list(payload, key: str) -> list:
+    """Вернет непустой список payload[key] не длиннее USER_BULK_MAX."""
+    items = payload.get(key) if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValidationError(f'{key} должен быть непустым списком.')
+    if len(items) > USER_BULK_MAX:
+        raise ValidationError(
+            f'Не больше {USER_BULK_MAX} элементов за запрос.'
+        )
+    return items
+
+
+@csrf_exempt
+@check_access(
+    allowed_methods=['PUT'],
+    get_rules_for='user',
+)
+def bulk_update_users(request: HttpRequest) -> JsonResponse:
+    """
+    Массовое обновление пользователей.
+
+    Права проверяются одним фильтром запроса (can_update_all - любые,
+    can_update_own - только свой), изменения пишутся bulk_update.
+
+    Example:
+        PUT /api/users/bulk/update/
+        {"users": [{"id": "...", "first_name": "Иван"}, ...]}
+
+    Returns:
+        JsonResponse: {'updated': [...], 'skipped': [...], 'errors': {...}}
+            skipped - не найдены или нет прав, errors - ошибки по id
+    """
+    items = parse_bulk_list(parse_json_body(request), 'users')
+
+    changes, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = UserBulkUpdateSerializer(data=item, partial=True)
+        if not serializer.is_valid():
+            key = item.get('id') if isinstance(item, dict) else None
+            errors[str(key or index)] = serializer.errors
+            continue
+        data = dict(serializer.validated_data)
+        user_id = data.pop('id', None)
+        if user_id is None:
+            errors[str(index)] = {'id': ['Обязательное поле.']}
+        elif user_id in changes:
+            errors[str(user_id)] = {'id': ['id повторяется в списке.']}
+        else:
+            changes[user_id] = data
+
+    emails = {}
+    for user_id, data in changes.items():
+        if 'email' in data:
+            data['email'] = User.objects.normalize_email(data['email'])
+            emails.setdefault(data['email'], []).append(user_id)
+    taken = set(User.objects.filter(email__in=emails).exclude(
+        id__in=changes
+    ).values_list('email', flat=True))
+    for email, user_ids in emails.items():
+        if email in taken or len(user_ids) > 1:
+            for user_id in user_ids:
+                errors[str(user_id)] = {
+                    'email': ['Пользователь с таким email уже есть.']
+                }
+                changes.pop(user_id)
+
+    fields = {name for data in changes.values() for name in data}
+    users = list(User.objects.filter(
+        id__in=changes, is_active=True
+    ).for_user(
+        request.user, Action.UPDATE, request.access_rules
+    ).only('id', *fields))
+
+    now = timezone.now()
+    for user in users:
+        for name, value in changes[user.id].items():
+            setattr(user, name, value)
+        user.updated_at = now
+
+    if users:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_update(
+                    users, [*fields, 'updated_at'], batch_size=1000
+                )
+        except IntegrityError:
+            return JsonResponse(
+                {'error': 'Конфликт email, повторите запрос.'},
+                status=409
+            )
+        Session.evict_cached_for_users([user.id for user in users])
+
+    updated = {user.id for user in users}
+    return JsonResponse({
+        'updated': list(updated),
+        'skipped': [
+            user_id for user_id in changes if user_id not in updated
+        ],
+        'errors': errors,
+    })
+
+
+@csrf_exempt
+@check_access(
+    allowed_methods=['POST'],
+    get_rules_for='user',
+)
+def bulk_delete_users(request: HttpRequest) -> JsonResponse:
+    """
+    Массовое мягкое удаление пользователей.
+
+    Права проверяются одним фильтром запроса, пользователи
+    деактивируются одним UPDATE, их сессии становятся недействительными.
+
+    Example:
+        POST /api/users/bulk/delete/
+        {"ids": ["...", "..."]}
+
+    Returns:
+        JsonResponse: {'deleted': [...], 'skipped': [...]}
+            skipped - не найдены или нет прав
+    """
+    ids = parse_bulk_list(parse_json_body(request), 'ids')
+    try:
+        ids = list(dict.fromkeys(uuid.UUID(str(value)) for value in ids))
+    except ValueError:
+        raise ValidationError('ids должен содержать UUID.')
+
+    users = User.objects.filter(id__in=ids, is_active=True).for_user(
+        request.user, Action.DELETE, request.access_rules
+    )
+    with transaction.atomic():
+        deleted = set(users.select_for_update().values_list('id', flat=True))
+        now = timezone.now()
+        User.objects.filter(id__in=deleted).update(
+            is_active=False, deleted_at=now, updated_at=now
+        )
+        Session.invalidate_for_users(deleted)
+
+    return JsonResponse({
+        'deleted': list(deleted),
+        'skipped': [user_id for user_id in ids if user_id not in deleted],
+    })
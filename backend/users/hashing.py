@@ -0,0 +1,255 @@
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+from django.conf import settings
+from utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusyError(Exception):
+    """Очередь хэширования паролей переполнена."""
+
+    def __init__(
+            self,
+            message='Сервис перегружен, повторите попытку позже.',
+            status=503,
+            retry_after=1
+    ):
+        self.message = message
+        self.status = status
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+class BcryptHasher:
+    """bcrypt с настраиваемым числом раундов (2^rounds итераций)."""
+
+    algorithm = 'bcrypt'
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def identifies(self, password_hash: str) -> bool:
+        return password_hash.startswith('$2')
+
+    def hash(self, raw_password: bytes) -> str:
+        return bcrypt.hashpw(
+            raw_password,
+            bcrypt.gensalt(self.rounds),
+        ).decode('utf-8')
+
+    def verify(self, raw_password: bytes, password_hash: str) -> bool:
+        return bcrypt.checkpw(raw_password, password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return int(password_hash.split('$')[2]) != self.rounds
+
+
+class Argon2Hasher:
+    """argon2id, требует пакет argon2-cffi."""
+
+    algorithm = 'argon2'
+
+    def __init__(
+            self,
+            time_cost: int = 3,
+            memory_cost: int = 65536,
+            parallelism: int = 4
+    ):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+
+    @property
+    def hasher(self):
+        from argon2 import PasswordHasher
+
+        return PasswordHasher(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+        )
+
+    def identifies(self, password_hash: str) -> bool:
+        return password_hash.startswith('$argon2')
+
+    def hash(self, raw_password: bytes) -> str:
+        return self.hasher.hash(raw_password)
+
+    def verify(self, raw_password: bytes, password_hash: str) -> bool:
+        from argon2.exceptions import VerificationError
+
+        try:
+            return self.hasher.verify(password_hash, raw_password)
+        except VerificationError:
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self.hasher.check_needs_rehash(password_hash)
+
+
+HASHERS = {
+    BcryptHasher.algorithm: BcryptHasher,
+    Argon2Hasher.algorithm: Argon2Hasher,
+}
+
+
+def get_hasher(algorithm: str = None):
+    """
+    Вернет hasher из политики PASSWORD_HASHING.
+    Для algorithm, отличного от текущего, - hasher с параметрами
+    по умолчанию (достаточно для проверки старых хэшей).
+    """
+    policy = getattr(settings, 'PASSWORD_HASHING', {})
+    current = policy.get('ALGORITHM', BcryptHasher.algorithm)
+    algorithm = algorithm or current
+    options = policy.get('OPTIONS', {}) if algorithm == current else {}
+    return HASHERS[algorithm](
+        **{key.lower(): value for key, value in options.items()}
+    )
+
+
+def identify_hasher(password_hash: str):
+    """Вернет hasher, которым создан хэш, или None."""
+    for algorithm in HASHERS:
+        hasher = get_hasher(algorithm)
+        if hasher.identifies(password_hash):
+            return hasher
+    return None
+
+
+def _hash(hasher, raw_password: bytes) -> str:
+    return hasher.hash(raw_password)
+
+
+def _verify(hasher, raw_password: bytes, password_hash: str) -> bool:
+    return hasher.verify(raw_password, password_hash)
+
+
+class HashingPool:
+    """
+    Ограниченный пул для хэширования паролей.
+
+    Одновременно выполняется не более max_workers хэшей и ждут не более
+    queue_size. Если мест нет, запрос сразу получает
+    PasswordHashingBusyError (503), а не занимает worker в ожидании.
+    """
+
+    EXECUTORS = {
+        'thread': ThreadPoolExecutor,
+        'process': ProcessPoolExecutor,
+    }
+
+    def __init__(
+            self,
+            executor: str = 'thread',
+            max_workers: int = 4,
+            queue_size: int = 32,
+            retry_after: int = 1
+    ):
+        self.executor_class = self.EXECUTORS.get(executor)
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self.executor_class(
+                        max_workers=self.max_workers
+                    )
+        return self._executor
+
+    def run(self, func, *args, block: bool = False):
+        """
+        Выполнит func(*args) в пуле и дождется результата.
+        block=True ждет свободного места вместо отказа (для фоновых задач).
+        """
+        if not self._slots.acquire(blocking=block):
+            with self._lock:
+                self._rejected += 1
+            logger.warning('Очередь хэширования паролей переполнена.')
+            raise PasswordHashingBusyError(retry_after=self.retry_after)
+
+        with self._lock:
+            self._depth += 1
+        start = time.perf_counter()
+        try:
+            with span('hashing'):
+                if self.executor_class is None:
+                    return func(*args)
+                return self.executor.submit(func, *args).result()
+        finally:
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._depth -= 1
+                self._completed += 1
+                self._latency_sum += latency
+                self._latency_max = max(self._latency_max, latency)
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """Метрики пула в текущем процессе."""
+        with self._lock:
+            return {
+                'queue_depth': self._depth,
+                'capacity': self.max_workers + self.queue_size,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'latency_seconds_sum': self._latency_sum,
+                'latency_seconds_max': self._latency_max,
+            }
+
+
+_config = getattr(settings, 'PASSWORD_HASHING_POOL', {})
+hashing_pool = HashingPool(
+    executor=_config.get('EXECUTOR', 'thread'),
+    max_workers=_config.get('MAX_WORKERS', 4),
+    queue_size=_config.get('QUEUE_SIZE', 32),
+    retry_after=_config.get('RETRY_AFTER', 1),
+)
+
+
+def hash_password(raw_password: str, block: bool = False) -> str:
+    """Вернет хэш пароля по текущей политике, вычисленный в hashing_pool."""
+    return hashing_pool.run(
+        _hash,
+        get_hasher(),
+        raw_password.encode('utf-8'),
+        block=block,
+    )
+
+
+def verify_password(raw_password: str, password_hash: str) -> bool:
+    """Проверит пароль в hashing_pool хэшером, которым создан хэш."""
+    hasher = identify_hasher(password_hash)
+    if hasher is None:
+        return False
+    return hashing_pool.run(
+        _verify,
+        hasher,
+        raw_password.encode('utf-8'),
+        password_hash,
+    )
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """Устарели ли алгоритм или параметры хэша относительно политики."""
+    hasher = get_hasher()
+    if not hasher.identifies(password_hash):
+        return True
+    return hasher.needs_rehash(password_hash)
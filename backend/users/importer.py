@@ -0,0 +1,177 @@
+"""
+Массовый импорт пользователей из NDJSON или CSV.
+
+Строки проверяются пачками по chunk_size: роли читаются один раз,
+занятые email ищутся одним запросом на пачку, пароли хэшируются
+параллельно в hashing_pool, пачка записывается через bulk_create.
+Ошибочные строки попадают в отчет и не прерывают импорт.
+"""
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from access.api.models import AccessRole
+from django.db import IntegrityError, transaction
+from users.api.serializers import UserImportSerializer
+from users.hashing import hash_password, hashing_pool
+from users.models import User
+from utils import codec
+
+IMPORT_FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'text/csv': 'csv',
+}
+IMPORT_CHUNK_SIZE = 1000
+
+
+class ImportResult:
+    """Итог импорта: число созданных и ошибки по номерам строк."""
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, row: int, errors):
+        self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self) -> dict:
+        return {
+            'created': self.created,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
+
+
+def read_ndjson(lines):
+    """Вернет пары (номер строки, dict или текст ошибки)."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = codec.loads(line)
+        except (codec.JSONDecodeError, UnicodeDecodeError):
+            yield number, 'Неверный JSON формат'
+            continue
+        if not isinstance(row, dict):
+            yield number, 'Ожидается JSON-объект'
+            continue
+        yield number, row
+
+
+def read_csv(lines):
+    """То же для CSV с заголовком; номер строки считается с заголовка."""
+    text = (
+        line.decode('utf-8-sig' if number == 0 else 'utf-8', 'replace')
+        for number, line in enumerate(lines)
+    )
+    reader = csv.DictReader(text)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, 'Лишние значения в строке'
+            continue
+        yield reader.line_num, {
+            name: value for name, value in row.items() if value is not None
+        }
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+def import_users(
+        lines,
+        import_format: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        default_role: str = 'user'
+) -> ImportResult:
+    """Импортирует пользователей из строк (bytes) в формате import_format."""
+    result = ImportResult()
+    roles = {role.name: role for role in AccessRole.objects.all()}
+    if default_role not in roles:
+        roles[default_role], _ = AccessRole.objects.get_or_create(
+            name=default_role
+        )
+    seen_emails = set()
+
+    rows = READERS[import_format](lines)
+    while chunk := list(islice(rows, chunk_size)):
+        valid = []
+        for number, row in chunk:
+            if isinstance(row, str):
+                result.add_error(number, row)
+                continue
+            data = _validate(row, roles, default_role, seen_emails)
+            if 'errors' in data:
+                result.add_error(number, data['errors'])
+            else:
+                valid.append((number, data))
+        _create_chunk(valid, result)
+
+    return result
+
+
+def _validate(row: dict, roles: dict, default_role: str, seen: set) -> dict:
+    serializer = UserImportSerializer(data=row)
+    if not serializer.is_valid():
+        return {'errors': serializer.errors}
+
+    data = serializer.validated_data
+    data['email'] = User.objects.normalize_email(data['email'])
+    if data['email'] in seen:
+        return {'errors': {'email': ['Email повторяется в файле.']}}
+    seen.add(data['email'])
+
+    role = roles.get(data.get('role') or default_role)
+    if role is None:
+        return {'errors': {'role': [f'Роль {data["role"]} не найдена.']}}
+    data['role'] = role
+    return data
+
+
+def _create_chunk(valid: list, result: ImportResult):
+    taken = set(User.objects.filter(
+        email__in=[data['email'] for _, data in valid]
+    ).values_list('email', flat=True))
+
+    rows = []
+    for number, data in valid:
+        if data['email'] in taken:
+            result.add_error(
+                number, {'email': ['Пользователь с таким email уже есть.']}
+            )
+        else:
+            rows.append((number, data))
+    if not rows:
+        return
+
+    with ThreadPoolExecutor(max_workers=hashing_pool.max_workers) as pool:
+        password_hashes = pool.map(
+            partial(hash_password, block=True),
+            [data.pop('password') for _, data in rows]
+        )
+        users = [
+            User(password_hash=password_hash, **data)
+            for (_, data), password_hash in zip(rows, password_hashes)
+        ]
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+    except IntegrityError:
+        # email заняли параллельно: сохраним пачку построчно.
+        for (number, _), user in zip(rows, users):
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+            except IntegrityError:
+                result.add_error(
+                    number,
+                    {'email': ['Пользователь с таким email уже есть.']}
+                )
+            else:
+                result.created += 1
+        return
+
+    result.created += len(users)
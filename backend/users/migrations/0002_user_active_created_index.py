@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at', 'id'], name='auth_users_active_created_idx'),
+        ),
+    ]
@@ -1,13 +1,16 @@
 import uuid
 
-import bcrypt
-from access.api.models import AccessRole
+from access.api.models import AccessRole, Session
+from access.api.querysets import AccessQuerySet
 from django.contrib.auth.base_user import BaseUserManager
 from django.db import models
+from django.db.models import DEFERRED
 from django.utils import timezone
+from users.hashing import (hash_password, password_needs_rehash,
+                           verify_password)
 
 
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(AccessQuerySet)):
     """Менеджер объектов пользователей."""
 
     def create_user(
@@ -99,25 +102,84 @@ class User(models.Model):
 
     objects = UserManager()
 
+    access_element = 'user'
+    access_owner_field = 'id'
+
     class Meta:
         db_table = 'auth_users'
+        indexes = [
+            # Списки и выгрузка: is_active=True, порядок (created_at, id).
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(is_active=True),
+                name='auth_users_active_created_idx',
+            ),
+        ]
+
+    # При изменении этих полей сессии пользователя отзываются.
+    ACCESS_FIELDS = ('role', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_access = instance.access_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        # Сюда же приходит догрузка отложенного поля (only/defer):
+        # загруженное значение становится исходным, а не изменением.
+        super().refresh_from_db(using, fields, **kwargs)
+        current = self.access_state()
+        loaded = getattr(self, '_loaded_access', current)
+        self._loaded_access = tuple(
+            value if fields is None or name in fields or attname in fields
+            else old
+            for (name, attname), value, old in zip(
+                self.access_attnames(), current, loaded
+            )
+        )
+
+    @classmethod
+    def access_attnames(cls) -> list:
+        return [
+            (name, cls._meta.get_field(name).attname)
+            for name in cls.ACCESS_FIELDS
+        ]
+
+    def access_state(self) -> tuple:
+        return tuple(
+            self.__dict__.get(attname, DEFERRED)
+            for _, attname in self.access_attnames()
+        )
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        access_changed = (
+            self.access_state() != getattr(self, '_loaded_access', None)
+        )
+        self._loaded_access = self.access_state()
+        if adding:
+            return
+        if access_changed:
+            # Подписанный токен хранит role_id: недостаточно убрать
+            # сессию из кэша, ее нужно отозвать.
+            Session.invalidate_for_user(self.pk)
+        else:
+            Session.evict_cached_for_user(self.pk)
 
     def set_password(self, raw_password: str):
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(
-            raw_password.encode('utf-8'),
-            salt,
-        ).decode('utf-8')
+        self.password_hash = hash_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
         try:
-            return bcrypt.checkpw(
-                raw_password.encode('utf-8'),
-                self.password_hash.encode('utf-8'),
-            )
+            return verify_password(raw_password, self.password_hash)
         except (ValueError, AttributeError):
             return False
 
+    def password_needs_rehash(self) -> bool:
+        return password_needs_rehash(self.password_hash)
+
     def soft_delete(self):
         self.is_active = False
         self.deleted_at = timezone.now()
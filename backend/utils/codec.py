@@ -0,0 +1,68 @@
+"""
+JSON-кодек проекта: orjson, если установлен, иначе стандартный json.
+
+dumps возвращает компактные UTF-8 байты, UUID, datetime, date, time и
+Decimal кодируются одинаково в обоих вариантах. loads принимает bytes
+без предварительного decode.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def _default(obj):
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, Promise)):
+        return str(obj)
+    raise TypeError(
+        f'Object of type {type(obj).__name__} is not JSON serializable'
+    )
+
+
+if orjson is not None:
+    def dumps(obj) -> bytes:
+        return orjson.dumps(
+            obj, default=_default, option=orjson.OPT_NON_STR_KEYS
+        )
+
+    loads = orjson.loads
+else:
+    _encoder = json.JSONEncoder(
+        default=_default,
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+
+    def dumps(obj) -> bytes:
+        return _encoder.encode(obj).encode('utf-8')
+
+    loads = json.loads
+
+
+class JsonResponse(HttpResponse):
+    """django.http.JsonResponse, кодирующий данные через dumps."""
+
+    def __init__(self, data, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set '
+                'the safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
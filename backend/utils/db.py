@@ -0,0 +1,57 @@
+"""
+Маршрутизация чтения на реплики.
+
+Чтения идут на случайную реплику из READ_REPLICAS['ALIASES'], записи -
+в default. После первой записи в контексте (запрос, команда) чтения
+тоже идут в default. PrimaryStickinessMiddleware читает из default
+изменяющие запросы (POST, PUT, ...) целиком и продлевает чтение из
+default на STICKY_SECONDS для следующих запросов клиента.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_pinned = ContextVar('pinned_to_primary', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+
+def replica_aliases() -> list:
+    return getattr(settings, 'READ_REPLICAS', {}).get('ALIASES', [])
+
+
+def reading_from_replica() -> bool:
+    """Пойдет ли чтение в текущем контексте на реплику."""
+    return bool(replica_aliases()) and not _pinned.get()
+
+
+@contextmanager
+def use_primary():
+    """Все чтения внутри блока - из default."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Чтение с реплик; запись и чтение после нее - в default."""
+
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return random.choice(replica_aliases())
+        return None
+
+    def db_for_write(self, model, **hints):
+        if not replica_aliases():
+            return None
+        _pinned.set(True)
+        _wrote.set(True)
+        # Объект, прочитанный с реплики, тоже сохраняется в default.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,205 @@
+"""
+Профилирование запросов: время view, число и время SQL-запросов,
+именованные участки (span) внутри запроса.
+
+Включается INSTRUMENTATION['ENABLED']. Данные текущего запроса живут в
+contextvar, поэтому доходят и до sync-кода, вызванного из async-view
+через sync_to_async. Агрегаты хранятся в памяти процесса и отдаются в
+формате Prometheus (utils.views.metrics).
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_profile = ContextVar('request_profile', default=None)
+
+
+def instrumentation_enabled() -> bool:
+    return getattr(settings, 'INSTRUMENTATION', {}).get('ENABLED', False)
+
+
+class RequestProfile:
+    """Измерения одного запроса."""
+
+    __slots__ = ('start', 'queries', 'query_time', 'spans')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.spans = {}
+
+    def add_span(self, name: str, duration: float):
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+
+def start_profile():
+    """Начнет профиль запроса; вернет token для finish_profile."""
+    return _profile.set(RequestProfile())
+
+
+def finish_profile(token) -> RequestProfile:
+    profile = _profile.get()
+    _profile.reset(token)
+    return profile
+
+
+@contextmanager
+def span(name: str):
+    """Замерит участок кода, если запрос профилируется."""
+    profile = _profile.get()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(name, time.perf_counter() - start)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper: посчитает запрос и его время в профиле запроса."""
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.query_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def enable_query_recording():
+    """Подключит record_query к открытым и будущим соединениям."""
+    connection_created.connect(install_query_recorder)
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(None, connection)
+
+
+class Metrics:
+    """Агрегаты по view в памяти процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = defaultdict(int)
+            self.buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+            self.duration = defaultdict(float)
+            self.queries = defaultdict(int)
+            self.query_time = defaultdict(float)
+            self.span_calls = defaultdict(int)
+            self.span_time = defaultdict(float)
+
+    def observe(
+            self,
+            view: str,
+            method: str,
+            status: int,
+            duration: float,
+            profile: RequestProfile
+    ):
+        with self._lock:
+            self.requests[view, method, status] += 1
+            self.duration[view] += duration
+            buckets = self.buckets[view]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    buckets[index] += 1
+            self.queries[view] += profile.queries
+            self.query_time[view] += profile.query_time
+            for name, seconds in profile.spans.items():
+                self.span_calls[view, name] += 1
+                self.span_time[view, name] += seconds
+
+    def render(self) -> str:
+        """Текст в формате Prometheus exposition 0.0.4."""
+        with self._lock:
+            lines = [
+                '# TYPE http_requests_total counter',
+                *(
+                    f'http_requests_total{{view="{view}",method="{method}",'
+                    f'status="{status}"}} {count}'
+                    for (view, method, status), count
+                    in sorted(self.requests.items())
+                ),
+                '# TYPE http_request_duration_seconds histogram',
+            ]
+            for view, buckets in sorted(self.buckets.items()):
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    lines.append(
+                        f'http_request_duration_seconds_bucket'
+                        f'{{view="{view}",le="{bound}"}} {count}'
+                    )
+                total = sum(
+                    count for (name, _, _), count in self.requests.items()
+                    if name == view
+                )
+                lines += [
+                    f'http_request_duration_seconds_bucket'
+                    f'{{view="{view}",le="+Inf"}} {total}',
+                    f'http_request_duration_seconds_sum{{view="{view}"}} '
+                    f'{self.duration[view]}',
+                    f'http_request_duration_seconds_count{{view="{view}"}} '
+                    f'{total}',
+                ]
+            lines.append('# TYPE db_queries_total counter')
+            lines += [
+                f'db_queries_total{{view="{view}"}} {count}'
+                for view, count in sorted(self.queries.items())
+            ]
+            lines.append('# TYPE db_query_duration_seconds_total counter')
+            lines += [
+                f'db_query_duration_seconds_total{{view="{view}"}} {seconds}'
+                for view, seconds in sorted(self.query_time.items())
+            ]
+            lines.append('# TYPE span_calls_total counter')
+            lines += [
+                f'span_calls_total{{view="{view}",span="{name}"}} {count}'
+                for (view, name), count in sorted(self.span_calls.items())
+            ]
+            lines.append('# TYPE span_duration_seconds_total counter')
+            lines += [
+                f'span_duration_seconds_total{{view="{view}",span="{name}"}} '
+                f'{seconds}'
+                for (view, name), seconds in sorted(self.span_time.items())
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+def server_timing(profile: RequestProfile, duration: float) -> str:
+    """Значение заголовка Server-Timing (длительности в мс)."""
+    parts = [
+        f'total;dur={duration * 1000:.2f}',
+        f'db;dur={profile.query_time * 1000:.2f};'
+        f'desc="{profile.queries} queries"',
+    ]
+    parts += [
+        f'{name};dur={seconds * 1000:.2f}'
+        for name, seconds in profile.spans.items()
+    ]
+    return ', '.join(parts)
+
+
+metrics = Metrics()
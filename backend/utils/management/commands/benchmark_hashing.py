@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from users.hashing import Argon2Hasher, BcryptHasher, get_hasher
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет скорость хэширования паролей (хэшей/сек на одно ядро) '
+        'для разных параметров стоимости.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--algorithm',
+            choices=['bcrypt', 'argon2'],
+            default=get_hasher().algorithm,
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            nargs='+',
+            default=[10, 11, 12, 13, 14],
+            help='Раунды bcrypt.',
+        )
+        parser.add_argument(
+            '--time-cost',
+            type=int,
+            nargs='+',
+            default=[2, 3, 4],
+            help='time_cost argon2.',
+        )
+        parser.add_argument(
+            '--memory-cost',
+            type=int,
+            default=65536,
+            help='memory_cost argon2, КиБ.',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=2.0,
+            help='Секунд на каждый вариант.',
+        )
+
+    def handle(self, *args, **options):
+        if options['algorithm'] == 'bcrypt':
+            hashers = [
+                (f'rounds={rounds}', BcryptHasher(rounds=rounds))
+                for rounds in options['rounds']
+            ]
+        else:
+            try:
+                import argon2  # noqa: F401
+            except ImportError:
+                raise CommandError('Для argon2 установите argon2-cffi.')
+            hashers = [
+                (
+                    f'time_cost={time_cost}',
+                    Argon2Hasher(
+                        time_cost=time_cost,
+                        memory_cost=options['memory_cost'],
+                    )
+                )
+                for time_cost in options['time_cost']
+            ]
+
+        self.stdout.write(
+            f'{"параметры":<16}{"хэшей/сек":>12}{"мс на хэш":>12}'
+        )
+        for label, hasher in hashers:
+            count = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < options['duration']:
+                hasher.hash(b'benchmark-password')
+                count += 1
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{label:<16}{count / elapsed:>12.1f}'
+                f'{elapsed / count * 1000:>12.1f}'
+            )
@@ -1,70 +1,240 @@
-from access.api.models import AccessRole, AccessRule, BusinessElement
-from django.core.management.base import BaseCommand
+import random
+import uuid
+from datetime import timedelta
+from itertools import islice
+
+from access.api.models import (AccessRole, AccessRule, BusinessElement,
+                               Session)
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from users.hashing import hash_password
 from users.models import User
 
+LOAD_DOMAIN = 'load.test'
+NO_LOAD_USERS = (
+    'Нет активных сгенерированных пользователей, сначала создайте их '
+    '(--users).'
+)
+
+FIRST_NAMES = ('Иван', 'Петр', 'Анна', 'Мария', 'Олег', 'Елена', 'Сергей')
+LAST_NAMES = ('Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов')
+
+BASE_RULES = {
+    'admin': dict(
+        can_read_own=True, can_read_all=True, can_create=True,
+        can_update_own=True, can_update_all=True,
+        can_delete_own=True, can_delete_all=True,
+    ),
+    'user': dict(
+        can_read_own=True, can_read_all=True, can_create=False,
+        can_update_own=True, can_update_all=False,
+        can_delete_own=True, can_delete_all=False,
+    ),
+    'guest': dict(
+        can_read_own=False, can_read_all=False, can_create=True,
+        can_update_own=False, can_update_all=False,
+        can_delete_own=False, can_delete_all=False,
+    ),
+}
+
+# Наборы прав для сгенерированных ролей и их доля.
+RULE_PROFILES = (
+    (0.5, dict(can_read_own=True, can_update_own=True)),
+    (0.25, dict(can_read_own=True, can_read_all=True, can_update_own=True,
+                can_delete_own=True)),
+    (0.15, dict(can_read_own=True, can_read_all=True, can_create=True,
+                can_update_own=True, can_update_all=True)),
+    (0.1, dict()),
+)
+
+# Доли сессий: действующие, истекшие, отозванные.
+SESSION_STATES = ((0.7, 'valid'), (0.2, 'expired'), (0.1, 'revoked'))
+
 
 class Command(BaseCommand):
-    help = 'Наполняет БД тестовыми данными.'
+    help = (
+        'Наполняет БД тестовыми данными: базовые роли, правила и '
+        'пользователи admin@example.com/user@example.com, а для нагрузочных '
+        'тестов - сгенерированные роли, элементы, пользователи и сессии. '
+        'Повторный запуск досоздает недостающее.'
+    )
 
-    def handle(self, *args, **options):
-        admin_role = AccessRole.objects.create(name='admin')
-        user_role = AccessRole.objects.create(name='user')
-        guest_role = AccessRole.objects.create(name='guest')
-
-        users_element = BusinessElement.objects.create(name='user')
-
-        User.objects.create_user(
-            email='admin@example.com',
-            password='adminpass',
-            first_name='Admin',
-            last_name='Super',
-            patronymic='',
-            role=admin_role
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=0,
+            help=f'Сгенерированных пользователей (user<N>@{LOAD_DOMAIN}).',
         )
-
-        User.objects.create_user(
-            email='user@example.com',
-            password='userpass',
-            first_name='Normal',
-            last_name='User',
-            patronymic='',
-            role=user_role
+        parser.add_argument(
+            '--roles', type=int, default=0,
+            help='Дополнительных ролей (role-<N>).',
         )
-
-        AccessRule.objects.get_or_create(
-            role=admin_role,
-            element=users_element,
-            can_read_own=True,
-            can_read_all=True,
-            can_create=True,
-            can_update_own=True,
-            can_update_all=True,
-            can_delete_own=True,
-            can_delete_all=True
+        parser.add_argument(
+            '--elements', type=int, default=0,
+            help='Дополнительных бизнес-элементов (element-<N>).',
+        )
+        parser.add_argument(
+            '--sessions', type=int, default=0,
+            help='Сессий сгенерированных пользователей.',
         )
+        parser.add_argument(
+            '--password', default='loadpass',
+            help='Пароль сгенерированных пользователей.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        for name in ('users', 'roles', 'elements', 'sessions'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть отрицательным.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть больше 0.')
 
-        AccessRule.objects.get_or_create(
-            role=user_role,
-            element=users_element,
-            can_read_own=True,
-            can_read_all=True,
-            can_create=False,
-            can_update_own=True,
-            can_update_all=False,
-            can_delete_own=True,
-            can_delete_all=False
+        self.chunk_size = options['chunk_size']
+        self.random = random.Random(options['seed'])
+
+        roles = self.create_base_data()
+        roles += self.create_roles(options['roles'], options['elements'])
+        if options['users']:
+            self.create_users(options['users'], roles, options['password'])
+        if options['sessions']:
+            self.create_sessions(options['sessions'])
+
+        self.stdout.write(self.style.SUCCESS('Фикстуры созданы!'))
+
+    def create_base_data(self) -> list:
+        """Базовые роли, элемент user, правила и два пользователя."""
+        roles = {
+            name: AccessRole.objects.get_or_create(name=name)[0]
+            for name in BASE_RULES
+        }
+        users_element, _ = BusinessElement.objects.get_or_create(name='user')
+        for name, rule in BASE_RULES.items():
+            AccessRule.objects.update_or_create(
+                role=roles[name], element=users_element, defaults=rule
+            )
+
+        for email, password, first_name, last_name, role in (
+            ('admin@example.com', 'adminpass', 'Admin', 'Super', 'admin'),
+            ('user@example.com', 'userpass', 'Normal', 'User', 'user'),
+        ):
+            if not User.objects.filter(email=email).exists():
+                User.objects.create_user(
+                    email=email,
+                    password=password,
+                    first_name=first_name,
+                    last_name=last_name,
+                    patronymic='',
+                    role=roles[role]
+                )
+        return [roles['user'], roles['admin']]
+
+    def create_roles(self, count: int, element_count: int) -> list:
+        """Роли role-<N> и правила для них на user и element-<N>."""
+        AccessRole.objects.bulk_create(
+            [AccessRole(name=f'role-{index}') for index in range(count)],
+            ignore_conflicts=True,
         )
+        BusinessElement.objects.bulk_create(
+            [
+                BusinessElement(name=f'element-{index}')
+                for index in range(element_count)
+            ],
+            ignore_conflicts=True,
+        )
+        roles = list(AccessRole.objects.filter(name__startswith='role-'))
+        elements = list(BusinessElement.objects.filter(
+            name__in=['user', *(f'element-{i}' for i in range(element_count))]
+        ))
 
-        AccessRule.objects.get_or_create(
-            role=guest_role,
-            element=users_element,
-            can_read_own=False,
-            can_read_all=False,
-            can_create=True,
-            can_update_own=False,
-            can_update_all=False,
-            can_delete_own=False,
-            can_delete_all=False
+        weights, profiles = zip(*RULE_PROFILES)
+        AccessRule.objects.bulk_create(
+            (
+                AccessRule(
+                    role=role,
+                    element=element,
+                    **self.random.choices(profiles, weights)[0]
+                )
+                for role in roles
+                for element in elements
+            ),
+            batch_size=self.chunk_size,
+            ignore_conflicts=True,
         )
+        return roles
 
-        self.stdout.write(self.style.SUCCESS('Фикстуры созданы!'))
+    def create_users(self, count: int, roles: list, password: str):
+        """
+        Пользователи user<N>@load.test с одним заранее вычисленным
+        хэшем пароля. Большинство - роль user, 0.1% - admin, остальные
+        распределены по сгенерированным ролям; 5% удалены (is_active=False).
+        """
+        password_hash = hash_password(password, block=True)
+        user_role, admin_role, *other_roles = roles
+        population = [user_role] * 900 + [admin_role]
+        population += other_roles * max(1, 99 // max(len(other_roles), 1))
+
+        emails = (f'user{index}@{LOAD_DOMAIN}' for index in range(count))
+        created = 0
+        while chunk := list(islice(emails, self.chunk_size)):
+            deleted_at = timezone.now()
+            users = []
+            for email in chunk:
+                is_active = self.random.random() >= 0.05
+                users.append(User(
+                    id=uuid.UUID(int=self.random.getrandbits(128), version=4),
+                    email=email,
+                    password_hash=password_hash,
+                    first_name=self.random.choice(FIRST_NAMES),
+                    last_name=self.random.choice(LAST_NAMES),
+                    role=self.random.choice(population),
+                    is_active=is_active,
+                    deleted_at=None if is_active else deleted_at,
+                ))
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            created += len(chunk)
+            self.stdout.write(f'Пользователи: {created}/{count}')
+
+    def create_sessions(self, count: int):
+        """
+        Сессии load-<N>, распределенные по сгенерированным пользователям
+        по кругу: 70% действующих, 20% истекших, 10% отозванных.
+        """
+        if not User.objects.filter(
+                email__endswith=f'@{LOAD_DOMAIN}', is_active=True
+        ).exists():
+            raise CommandError(NO_LOAD_USERS)
+
+        weights, states = zip(*SESSION_STATES)
+        user_ids = self.cycle_user_ids()
+        created = 0
+        while created < count:
+            now = timezone.now()
+            sessions = []
+            for index in range(created, min(created + self.chunk_size, count)):
+                state = self.random.choices(states, weights)[0]
+                hours = self.random.uniform(0.1, 24)
+                sessions.append(Session(
+                    user_id=next(user_ids),
+                    session_id=f'load-{index}',
+                    expire_at=now + timedelta(
+                        hours=-hours if state == 'expired' else hours
+                    ),
+                    is_valid=state != 'revoked',
+                ))
+            Session.objects.bulk_create(sessions, ignore_conflicts=True)
+            created += len(sessions)
+            self.stdout.write(f'Сессии: {created}/{count}')
+
+    def cycle_user_ids(self):
+        """id сгенерированных пользователей по кругу, без загрузки всех."""
+        users = User.objects.filter(
+            email__endswith=f'@{LOAD_DOMAIN}', is_active=True
+        ).order_by('email').values_list('id', flat=True)
+        while True:
+            empty = True
+            for user_id in users.iterator(chunk_size=self.chunk_size):
+                empty = False
+                yield user_id
+            if empty:
+                raise CommandError(NO_LOAD_USERS)
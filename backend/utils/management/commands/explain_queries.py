@@ -0,0 +1,78 @@
+import uuid
+
+from access.api.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from users.models import User
+from utils.pagination import encode_cursor, paginate_keyset
+
+
+def hot_queries():
+    """Частые запросы и индексы, которыми они должны выполняться."""
+    now = timezone.now()
+    return [
+        (
+            'Сессия по cookie',
+            Session.objects.select_related('user__role').filter(
+                session_id='explain', is_valid=True, expire_at__gt=now
+            ),
+            'sessions_valid_lookup_idx',
+        ),
+        (
+            'Страница пользователей',
+            paginate_keyset(
+                User.objects.filter(is_active=True),
+                ('created_at', 'id'),
+                encode_cursor([now, uuid.UUID(int=0)]),
+                100
+            ),
+            'auth_users_active_created_idx',
+        ),
+        (
+            'Очистка истекших сессий',
+            Session.objects.filter(expire_at__lte=now).values('pk')[:1000],
+            'sessions_expire_at_idx',
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит EXPLAIN частых запросов и проверяет, что они используют '
+        'свои индексы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Завершиться с ошибкой, если индекс не используется.',
+        )
+
+    def handle(self, *args, **options):
+        missing = []
+        for title, queryset, index in hot_queries():
+            # Чтения могут уйти на реплику (ReplicaRouter): фиксируем БД,
+            # чтобы SET и EXPLAIN выполнились на одном соединении.
+            queryset = queryset.using(queryset.db)
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                # На маленькой таблице планировщик выберет seq scan;
+                # проверяем, что индекс применим.
+                with connection.cursor() as cursor:
+                    cursor.execute('SET enable_seqscan = off')
+            plan = queryset.explain()
+            used = index in plan
+            if not used:
+                missing.append(index)
+            status = (
+                self.style.SUCCESS(f'использует {index}') if used
+                else self.style.ERROR(f'не использует {index}')
+            )
+            self.stdout.write(f'{title}: {status}\n{plan}\n')
+
+        if options['check'] and missing:
+            raise CommandError(
+                f'Индексы не используются: {", ".join(missing)}.'
+            )
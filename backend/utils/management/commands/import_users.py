@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from users.importer import IMPORT_CHUNK_SIZE, READERS, import_users
+from utils import codec
+
+
+class Command(BaseCommand):
+    help = 'Массовый импорт пользователей из NDJSON или CSV файла.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+        parser.add_argument(
+            '--format',
+            choices=list(READERS),
+            help='По умолчанию - по расширению файла.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help='Строк в пачке bulk_create.',
+        )
+        parser.add_argument(
+            '--role',
+            default='user',
+            help='Роль для строк без role.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['format'] or path.suffix.lstrip('.')
+        if import_format not in READERS:
+            raise CommandError('Укажите --format: ndjson или csv.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть больше 0.')
+
+        try:
+            with path.open('rb') as lines:
+                result = import_users(
+                    lines,
+                    import_format,
+                    options['chunk_size'],
+                    options['role'],
+                )
+        except OSError as error:
+            raise CommandError(error)
+
+        for error in result.as_dict()['errors']:
+            self.stderr.write(
+                f'Строка {error["row"]}: '
+                f'{codec.dumps(error["errors"]).decode()}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: {result.created}, ошибок: {len(result.errors)}.'
+        ))
@@ -0,0 +1,42 @@
+from access.api.reaper import purge_sessions, reaper_lock
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет истекшие и отозванные сессии пачками. '
+        'Подходит для запуска из cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Строк в одном DELETE.',
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=0.1,
+            help='Пауза между пачками, сек.',
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Не больше стольких пачек за запуск.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше 0.')
+
+        with reaper_lock() as acquired:
+            if not acquired:
+                raise CommandError('Очистка сессий уже выполняется.')
+            deleted = purge_sessions(
+                batch_size=options['batch_size'],
+                delay=options['delay'],
+                max_batches=options['max_batches'],
+            )
+        self.stdout.write(self.style.SUCCESS(f'Удалено сессий: {deleted}.'))
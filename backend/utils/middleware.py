@@ -0,0 +1,71 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from utils.db import _pinned, _wrote
+
+STICKY_COOKIE = 'use_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Read-your-writes при репликах. Изменяющие запросы читают из default,
+    чтобы не сохранить устаревшие с реплики данные. Если запрос что-то
+    записал, клиент получает cookie, и его запросы еще STICKY_SECONDS
+    читают из default (в том числе только что созданную сессию).
+    Ставится перед SessionAuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        tokens = self._begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = self._end(tokens)
+        return self._finish(response, wrote)
+
+    async def __acall__(self, request):
+        tokens = self._begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = self._end(tokens)
+        return self._finish(response, wrote)
+
+    def _begin(self, request):
+        return (
+            _pinned.set(
+                request.method not in SAFE_METHODS
+                or STICKY_COOKIE in request.COOKIES
+            ),
+            _wrote.set(False),
+        )
+
+    def _end(self, tokens) -> bool:
+        wrote = _wrote.get()
+        pinned_token, wrote_token = tokens
+        _wrote.reset(wrote_token)
+        _pinned.reset(pinned_token)
+        return wrote
+
+    def _finish(self, response, wrote: bool):
+        if wrote:
+            response.set_cookie(
+                STICKY_COOKIE,
+                '1',
+                max_age=settings.READ_REPLICAS.get('STICKY_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,90 @@
+import base64
+import json
+
+from django.core import exceptions
+from django.db.models import Q
+from utils.utils import ValidationError
+
+
+def encode_cursor(values: list) -> str:
+    """Упакует значения ключа последней строки страницы в cursor."""
+    raw = json.dumps([
+        value.isoformat() if hasattr(value, 'isoformat') else str(value)
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, fields: list) -> list:
+    """
+    Распакует cursor и приведет значения к типам полей модели fields.
+    При ошибке выбросит ValidationError.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValidationError('Неверный cursor.')
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValidationError('Неверный cursor.')
+    try:
+        values = [
+            field.to_python(value) for field, value in zip(fields, values)
+        ]
+    except (exceptions.ValidationError, TypeError, ValueError):
+        raise ValidationError('Неверный cursor.')
+    if None in values:
+        raise ValidationError('Неверный cursor.')
+    return values
+
+
+def parse_limit(
+        value,
+        default: int,
+        maximum: int,
+        name: str = 'limit'
+) -> int:
+    """Вернет размер страницы (или пачки) из параметра запроса name."""
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValidationError(f'{name} должен быть числом.')
+    if not 1 <= limit <= maximum:
+        raise ValidationError(f'{name} должен быть от 1 до {maximum}.')
+    return limit
+
+
+def paginate_keyset(queryset, ordering: tuple, cursor: str, limit: int):
+    """
+    Вернет queryset страницы после cursor по уникальному ключу ordering
+    (только по возрастанию). Выбирается limit + 1 строк, чтобы
+    split_page мог определить наличие следующей страницы.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, [
+            queryset.model._meta.get_field(name) for name in ordering
+        ])
+        condition = Q()
+        for index, field in enumerate(ordering):
+            prefix = dict(zip(ordering[:index], values[:index]))
+            condition |= Q(**prefix, **{f'{field}__gt': values[index]})
+        queryset = queryset.filter(condition)
+    return queryset[:limit + 1]
+
+
+def split_page(rows: list, ordering: tuple, limit: int):
+    """
+    Вернет строки страницы и cursor следующей (или None).
+    Строки - объекты модели или словари из .values().
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):
+        values = [last[field] for field in ordering]
+    else:
+        values = [getattr(last, field) for field in ordering]
+    return rows, encode_cursor(values)
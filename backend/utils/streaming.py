@@ -0,0 +1,37 @@
+from utils.codec import dumps
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def iter_json(items, stream_format: str = 'ndjson'):
+    """
+    Построчно закодирует items: NDJSON (объект на строку) или JSON-массив,
+    отдаваемый по элементу.
+    """
+    if stream_format == 'ndjson':
+        for item in items:
+            yield dumps(item) + b'\n'
+        return
+
+    separator = b'['
+    for item in items:
+        yield separator + dumps(item)
+        separator = b','
+    yield b'[]' if separator == b'[' else b']'
+
+
+async def aiter_json(items, stream_format: str = 'ndjson'):
+    """Асинхронная версия iter_json для async-итераторов."""
+    if stream_format == 'ndjson':
+        async for item in items:
+            yield dumps(item) + b'\n'
+        return
+
+    separator = b'['
+    async for item in items:
+        yield separator + dumps(item)
+        separator = b','
+    yield b'[]' if separator == b'[' else b']'
@@ -1,4 +1,4 @@
-import json
+from utils import codec
 
 
 class ValidationError(Exception):
@@ -27,8 +27,8 @@ def parse_json_body(request):
         )
 
     try:
-        return json.loads(request.body.decode('utf-8'))
-    except json.JSONDecodeError:
+        return codec.loads(request.body)
+    except codec.JSONDecodeError:
         raise JsonParseError('Неверный JSON формат', status=400)
     except UnicodeDecodeError:
         raise JsonParseError('Неверная кодировка данных', status=400)
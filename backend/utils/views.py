@@ -0,0 +1,47 @@
+from django.http import Http404, HttpResponse
+from users.hashing import hashing_pool
+from utils.instrumentation import instrumentation_enabled, metrics
+
+HASHING_POOL_METRICS = (
+    ('queue_depth', 'gauge'),
+    ('capacity', 'gauge'),
+    ('completed', 'counter'),
+    ('rejected', 'counter'),
+    ('latency_seconds_sum', 'counter'),
+    ('latency_seconds_max', 'gauge'),
+)
+
+
+def async_variant(sync_view):
+    """
+    Зарегистрирует декорируемую функцию как async-вариант sync_view.
+    Под ASGI его вызывает AsyncViewMiddleware, под WSGI работает
+    sync_view без перехода через async_to_sync. Применяется к уже
+    обернутому sync_view (после csrf_exempt и check_access).
+    """
+    def decorator(async_view):
+        sync_view.async_view = async_view
+        return async_view
+    return decorator
+
+
+def metrics_view(request):
+    """
+    Метрики процесса в формате Prometheus. Доступен, только если
+    включен INSTRUMENTATION; закрывать от внешней сети на прокси.
+    """
+    if not instrumentation_enabled():
+        raise Http404
+
+    stats = hashing_pool.stats()
+    lines = []
+    for name, metric_type in HASHING_POOL_METRICS:
+        metric = f'password_hashing_{name}'
+        if metric_type == 'counter' and not name.endswith('_sum'):
+            metric += '_total'
+        lines += [f'# TYPE {metric} {metric_type}', f'{metric} {stats[name]}']
+
+    return HttpResponse(
+        metrics.render() + '\n'.join(lines) + '\n',
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )